@@ -21,11 +21,18 @@ for ESP32 CAN bus applications and other embedded projects.
 '''
 
 import argparse
+import asyncio
 import logging
 
+try:
+    import uvloop  # optional, faster subprocess and pipe I/O for serial monitors
+except ImportError:
+    uvloop = None
+
 
 # Import our modules
 from py.gui.app_gui import AppGui
+from py.log.rich_log_handler import RichLogHandler
 
 
 def main(logging_level):
@@ -54,9 +61,9 @@ def main(logging_level):
 
     # Adjust logging level based on verbose flag
     if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
+        RichLogHandler.set_level(logging.DEBUG)
     else:
-        logging.getLogger().setLevel(logging.INFO)
+        RichLogHandler.set_level(logging.INFO)
 
     app = AppGui(
         kconfig_path=args.kconfig, 
@@ -65,6 +72,8 @@ def main(logging_level):
         debug=args.debug,
     )
 
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     app.run()
 
 
@@ -8,9 +8,9 @@ Handles configuration updates, code compilation with ESP-IDF, and firmware uploa
 Manages the complete workflow from Kconfig parsing to ESP32 flashing.
 '''
 
-import glob
 import re
-from typing import List, Optional, Type, Any, Tuple
+import shlex
+from typing import List, Optional, Type, Any, Tuple, Dict
 import traceback
 import os
 import shutil
@@ -36,6 +36,7 @@ class FlashApp:
     """
 
     WORKSPACES_DIR = ".workspaces"
+    _PORT_NAME_RE = re.compile(r'tty(?:ACM|USB)\d+$')
 
     def __init__(
             self,
@@ -128,7 +129,24 @@ class FlashApp:
             )
             return False
 
-    def _switch_to_workspace(self, lib_id: str, example_id: str):
+    def build_dependency_index(self) -> Dict[str, List[ConfigOption]]:
+        """
+        Precompute compatible examples for every library.
+        Same rules as check_dependencies(), evaluated once per lib/example pair
+        without option lookups by ID.
+        
+        Returns:
+            Dictionary lib_id -> examples compatible with the library (Kconfig order)
+        """
+        return {
+            lib_option.id: [
+                example_option for example_option in self.example_options
+                if not example_option.depends_on or lib_option.id in example_option.depends_on
+            ]
+            for lib_option in self.lib_options
+        }
+
+    def _switch_to_workspace(self, lib_id: str, example_id: str, workspace_name: Optional[str] = None):
         """
         Switch to isolated workspace directory for lib/example combination.
         Creates symbolic links to source directories and copies sdkconfig if needed.
@@ -137,6 +155,7 @@ class FlashApp:
         Args:
             lib_id: Library configuration ID
             example_id: Example configuration ID
+            workspace_name: Workspace directory name (default: '<lib_id>_<example_id>')
             
         Returns:
             True on success
@@ -146,7 +165,7 @@ class FlashApp:
                 reconfig_logger.info(f"Create symbolic link from \n{link_path} \nto \n{old_path}")
                 os.symlink(old_path, link_path)
         reconfig_logger.info(f"Switching to workspace for lib='{lib_id}' and example='{example_id}'")
-        workspace_dir = os.path.join(self.WORKSPACES_DIR, f"{lib_id}_{example_id}")
+        workspace_dir = os.path.join(self.WORKSPACES_DIR, workspace_name or f"{lib_id}_{example_id}")
         workspace_dir = os.path.realpath(os.path.expanduser(workspace_dir))
         if not os.path.exists(workspace_dir):
             os.makedirs(workspace_dir)
@@ -304,24 +323,26 @@ class FlashApp:
         jobs = self.get_optimal_jobs()
         should_fullclean = self.should_fullclean(None, None)
         if should_fullclean:
-            command = (
-                f"bash -c 'export MAKEFLAGS=-j{jobs} && "
+            script = (
+                f"export MAKEFLAGS=-j{jobs} && "
                 f"source {self.idf_setup_path} && "
                 f"cd {self._workspace_path} && "
-                f"idf.py fullclean && idf.py build'"
+                f"idf.py fullclean && idf.py build"
             )
         else:
-            command = (
-                f"bash -c 'export MAKEFLAGS=-j{jobs} && "
+            script = (
+                f"export MAKEFLAGS=-j{jobs} && "
                 f"source {self.idf_setup_path} && "
                 f"cd {self._workspace_path} && "
-                f"idf.py build'"
+                f"idf.py build"
             )
+        argv = ("bash", "-c", script)  # bash started directly, without /bin/sh in between
         success2 = await self.call_with_results(
             name="Compile ESP32 firmware",
             target=ShellCommandConfig(
                 name="Compile ESP32 firmware",  
-                command=command
+                command=shlex.join(argv),
+                argv=argv
             ), 
             logger=build_logger, 
         )
@@ -329,12 +350,13 @@ class FlashApp:
             return False
 
         time.sleep(0.5)
-        command = f"bash -c 'source {self.idf_setup_path} && cd {self._workspace_path} && idf.py -p /dev/{port} flash'"
+        argv = ("bash", "-c", f"source {self.idf_setup_path} && cd {self._workspace_path} && idf.py -p /dev/{port} flash")
         success3 = await self.call_with_results(
             name=f"Flash firmware to /dev/{port}",
             target=ShellCommandConfig(
                 name=f"Flash firmware to /dev/{port}", 
-                command=command
+                command=shlex.join(argv),
+                argv=argv
             ), 
             logger=flash_logger, 
         )
@@ -353,11 +375,14 @@ class FlashApp:
         if default_ports is None:
             default_ports = ['Port1', 'Port2', 'Port3', 'Port4']
         real_ports_found = False
-        ports = glob.glob('/dev/ttyACM*')
-        flash_ports1 = sorted(p[5:] for p in ports if re.match(r'/dev/ttyACM\d+$', p))
-        ports = glob.glob('/dev/ttyUSB*')
-        flash_ports2 = sorted(p[5:] for p in ports if re.match(r'/dev/ttyUSB\d+$', p))
-        flash_ports = flash_ports1 + flash_ports2
+        # One pass over /dev; names alone decide, no per-port stat calls
+        try:
+            with os.scandir('/dev') as entries:
+                names = [entry.name for entry in entries if self._PORT_NAME_RE.match(entry.name)]
+        except OSError:
+            names = []
+        # ttyACM ports first, then ttyUSB, each group sorted by name
+        flash_ports = sorted(names, key=lambda name: (name.startswith('ttyUSB'), name))
         if not flash_ports:
             return default_ports, real_ports_found
         else:
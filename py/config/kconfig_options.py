@@ -11,6 +11,7 @@ using kconfiglib for structured configuration management.
 import logging
 import os
 import re
+import traceback
 from dataclasses import dataclass
 from typing import List, Optional
 from pprint import pprint
@@ -129,8 +130,8 @@ class KconfigMenuItems:
 
         except Exception as e:
             logger.error(f"Error loading Kconfig: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
             exit(1)
 
     def add_option(self, menu_name: str, option: ConfigOption):
@@ -10,6 +10,7 @@ while preserving file structure and comments.
 
 import logging
 import os
+import traceback
 from dataclasses import dataclass
 from typing import Optional, Dict, List
 from py.log.rich_log_handler import LogSource, RichLogHandler
@@ -17,7 +18,7 @@ from py.log.rich_log_handler import LogSource, RichLogHandler
 reconfig_logger = RichLogHandler.get_logger(LogSource.RECONFIG)
 
 
-@dataclass
+@dataclass(slots=True)
 class SdkconfigLine:
     """
     Single configuration line from sdkconfig file.
@@ -26,16 +27,26 @@ class SdkconfigLine:
     key: str
     value: str
     original_line: str
+    dirty: bool = False  # value changed, original_line is stale
 
     def set_value(self, new_value: str) -> None:
         """
-        Update value and regenerate line text.
+        Update value; line text is regenerated only when written.
         
         Args:
             new_value: New configuration value
         """
         self.value = new_value
-        self.original_line = f"{self.key}={new_value}\n"
+        self.dirty = True
+
+    def to_line(self) -> str:
+        """
+        Get line text to be written to sdkconfig file.
+        
+        Returns:
+            Original line if value is unchanged, otherwise regenerated line
+        """
+        return f"{self.key}={self.value}\n" if self.dirty else self.original_line
 
 class Sdkconfig:
     """
@@ -77,25 +88,24 @@ class Sdkconfig:
             return
 
         try:
+            # Parsed while reading, the file is never held in memory as a list of lines
             with open(self.sdkconfig_path, 'r') as f:
-                lines = f.readlines()
-
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
+                for i, line in enumerate(f):
+                    line = line.strip()
+                    if not line or line[0] == '#':
+                        continue
 
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    self._sdkconfig_lines[key] = SdkconfigLine(key, value, line + '\n')
-                    self._keys_to_lines_number[key] = i
+                    key, sep, value = line.partition('=')
+                    if sep:
+                        self._sdkconfig_lines[key] = SdkconfigLine(key, value, line + '\n')
+                        self._keys_to_lines_number[key] = i
 
             reconfig_logger.info(f"Loaded {len(self._sdkconfig_lines)} config options from {self.sdkconfig_path}")
 
         except Exception as e:
             reconfig_logger.error(f"Error loading sdkconfig: {e}")
-            import traceback
-            reconfig_logger.debug(traceback.format_exc())
+            if reconfig_logger.isEnabledFor(logging.DEBUG):
+                reconfig_logger.debug(traceback.format_exc())
 
     def _normalize_key(self, key: str) -> str:
         """
@@ -138,20 +148,26 @@ class Sdkconfig:
     def write(self) -> None:
         """
         Write configuration to sdkconfig file with backup.
-        Creates .bak backup of existing file before writing.
+        New content is written to temporary file first, then existing file
+        is moved to .bak and temporary file renamed in its place,
+        so failed write never leaves sdkconfig truncated or missing.
         """
+        tmp_path = f"{self.sdkconfig_path}.tmp"
         try:
+            content = ''.join(line.to_line() for line in self._sdkconfig_lines.values())
+            with open(tmp_path, 'w') as f:
+                f.write(content)
+
             if os.path.exists(self.sdkconfig_path):
                 backup_path = f"{self.sdkconfig_path}.bak"
                 os.replace(self.sdkconfig_path, backup_path)
-
-            with open(self.sdkconfig_path, 'w') as f:
-                for line in self._sdkconfig_lines.values():
-                    f.write(line.original_line)
+            os.replace(tmp_path, self.sdkconfig_path)
 
             reconfig_logger.info(f"Successfully wrote sdkconfig to {self.sdkconfig_path}")
 
         except Exception as e:
             reconfig_logger.error(f"Error writing sdkconfig: {e}")
-            import traceback
-            reconfig_logger.debug(traceback.format_exc())
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if reconfig_logger.isEnabledFor(logging.DEBUG):
+                reconfig_logger.debug(traceback.format_exc())
@@ -8,13 +8,13 @@ Features real-time compilation output, port detection, and dependency validation
 '''
 
 import asyncio
-import logging
 import os
 import time
+from functools import partial
 
 from textual.app import App, ComposeResult
 from textual.reactive import reactive
-from textual.widgets import Button, Footer, TabbedContent, TabPane
+from textual.widgets import Button, Footer, Static, TabbedContent, TabPane
 from py.app_logic import FlashApp
 from py.monitor.shell_monitor_logic import ShellMonitorLogic
 from py.log.rich_log_handler import LogSource, RichLogHandler
@@ -23,11 +23,6 @@ from py.gui.serial_monitor_tab import SerialMonitorsTab
 
 python_logger = RichLogHandler.get_logger(LogSource.PYTHON)
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(message)s',
-)
-
 
 class AppGui(App):
     CSS_PATH = ["css/app.css", "css/build_flash_tab.css", "css/serial_monitor_tab.css"]
@@ -72,37 +67,61 @@ class AppGui(App):
         self.kconfig_path = kconfig_path
         self.sdkconfig_path = sdkconfig_path
         self.idf_setup_path = os.path.expanduser(idf_setup_path)
-        self.logic = FlashApp(
-            idf_setup_path, 
-            kconfig_path, 
-            sdkconfig_path, 
-            gui_app=self,
-            menu_name="*** CAN bus examples  ***"
+        # Created in on_mount (off the event loop) so the screen can be drawn first
+        self.logic: FlashApp | None = None
+        self.monitor_logic: ShellMonitorLogic | None = None
+        self.real_ports_found = False
+
+    def compose(self) -> ComposeResult:
+        yield Static("Loading Kconfig and sdkconfig ...", id="loading")
+        yield Footer()
+
+    async def on_mount(self) -> None:
+        """
+        Load configuration and detect ports in a worker thread, then build the tabs.
+        Kconfig/sdkconfig parsing is file I/O and would otherwise block the first paint.
+        """
+        loop = asyncio.get_running_loop()
+        self.logic = await loop.run_in_executor(
+            None,
+            partial(
+                FlashApp,
+                self.idf_setup_path,
+                self.kconfig_path,
+                self.sdkconfig_path,
+                gui_app=self,
+                menu_name="*** CAN bus examples  ***"
+            )
         )
         self.monitor_logic = ShellMonitorLogic(
-            idf_setup_path=idf_setup_path,
-            read_timeout=0.001,
-            chunk_size=4096,
+            idf_setup_path=self.idf_setup_path,
+            chunk_size=65536,
             flush_interval=0.05
         )
-        self.ports, self.real_ports_found = self.logic.find_flash_ports()
+        self.ports, self.real_ports_found = await loop.run_in_executor(None, self.logic.find_flash_ports)
+        await self.refresh_ui()
 
-    def compose(self) -> ComposeResult:
-        with TabbedContent():
-            with TabPane("Build & Flash"):
-                yield BuildFlashTab(
-                    logic=self.logic, 
-                    gui_app=self,
-                    ports=self.ports, 
-                    python_logger=python_logger,
-                    debug=self._debug
-                )
-            with TabPane("Serial Monitors"):
-                yield SerialMonitorsTab(
-                    self.ports, python_logger, self.monitor_logic, max_log_lines=500
-                )
-
-        yield Footer()
+    async def refresh_ui(self) -> None:
+        """Replace loading placeholder with Build & Flash and Serial Monitors tabs."""
+        tabs = TabbedContent()
+        await self.query_one("#loading").remove()
+        await self.mount(tabs, before=self.query_one(Footer))
+        await tabs.add_pane(TabPane(
+            "Build & Flash",
+            BuildFlashTab(
+                logic=self.logic,
+                gui_app=self,
+                ports=self.ports,
+                python_logger=python_logger,
+                debug=self._debug
+            )
+        ))
+        await tabs.add_pane(TabPane(
+            "Serial Monitors",
+            SerialMonitorsTab(
+                self.ports, python_logger, self.monitor_logic, max_log_lines=500
+            )
+        ))
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button events from main window."""
@@ -114,7 +133,9 @@ class AppGui(App):
         Stops all active monitor processes before shutting down to prevent subprocess errors.
         """
         try:
-            stopped_count = await self.monitor_logic.stop_all_monitors()
+            stopped_count = 0
+            if self.monitor_logic:
+                stopped_count = await self.monitor_logic.stop_all_monitors()
             if stopped_count > 0:
                 python_logger.info(f"Stopped {stopped_count} active monitor process(es) before quitting")
             await asyncio.sleep(0.2)
@@ -6,14 +6,21 @@ Build and flash tab for ESP32 Flash Tool GUI.
 Provides interface for selecting libraries, examples, and flashing firmware to multiple ESP32 ports.
 Includes real-time build output logging and dependency validation.
 '''
-from typing import List
+import logging
+from collections import namedtuple
+from functools import partial
+from typing import Dict, List
 from textual.app import App, ComposeResult
 from textual.containers import Grid, Container
+from textual.timer import Timer
 from textual.widgets import Static, Button, Select
 from py.log.rich_log_extended import RichLogExtended
 from py.app_logic import FlashApp
 from py.log.rich_log_handler import RichLogHandler
 
+# Widgets of one build/flash table row
+Row = namedtuple("Row", "port lib_select example_select flash_button")
+
 
 class BuildFlashTab(Container):
     """
@@ -21,6 +28,7 @@ class BuildFlashTab(Container):
     Contains configuration table for library/example selection per port,
     comprehensive build/flash log output, and toolbar with utility functions.
     """
+    RECOMPUTE_DELAY = 0.05  # seconds of Select inactivity before dependency check runs
 
     def __init__(
             self, 
@@ -36,6 +44,9 @@ class BuildFlashTab(Container):
         self.gui_app = gui_app
         self.python_logger = python_logger
         self._debug = debug
+        self._pending_recompute: Dict[str, Timer] = {}  # port -> scheduled dependency check
+        self._row_by_port: Dict[str, Row] = {}
+        self._row_by_select: Dict[Select, Row] = {}
 
     def _build_table(self) -> ComposeResult:
         """Generate build/flash table with port selection controls."""
@@ -47,17 +58,27 @@ class BuildFlashTab(Container):
             yield Static(port, classes="port")
 
             lib_choices = [(opt.display_name, opt.id) for opt in self.logic.lib_options]
-            yield Select(lib_choices, prompt="-- Select Lib --")
+            lib_select = Select(lib_choices, prompt="-- Select Lib --")
 
             example_choices = [(opt.display_name, opt.id) for opt in self.logic.example_options]
-            yield Select(example_choices, prompt="-- Select Example --")
+            example_select = Select(example_choices, prompt="-- Select Example --")
 
-            yield Button(
+            flash_button = Button(
                 f"⚡ Flash {port}",
                 id=f"flash-{port}",
                 classes="flash-button",
                 disabled=True
             )
+            self._index_row(Row(port, lib_select, example_select, flash_button))
+            yield lib_select
+            yield example_select
+            yield flash_button
+
+    def _index_row(self, row: Row) -> None:
+        """Register row widgets for O(1) lookup from event handlers."""
+        self._row_by_port[row.port] = row
+        self._row_by_select[row.lib_select] = row
+        self._row_by_select[row.example_select] = row
 
     def compose(self) -> ComposeResult:
         """Compose the tab layout with table, log viewer, and toolbar."""
@@ -85,52 +106,55 @@ class BuildFlashTab(Container):
         self.python_logger.info(f"SDKconfig: {self.logic.sdkconfig_path}")
         self.python_logger.info(
             f"Loaded {len(self.logic.lib_options)} lib options, {len(self.logic.example_options)} example options")
-        self.python_logger.debug("=== LIB OPTIONS ===")
-        for opt in self.logic.lib_options:
-            self.python_logger.debug(f"  {opt.id}: {opt.display_name}")
-
-        self.python_logger.debug("=== EXAMPLE OPTIONS ===")
-        for opt in self.logic.example_options:
-            depends_str = f", depends_on: {opt.depends_on}" if opt.depends_on else ""
-            self.python_logger.debug(f"  {opt.id}: {opt.display_name}{depends_str}")
+        if self.python_logger.isEnabledFor(logging.DEBUG):
+            self.python_logger.debug("=== LIB OPTIONS ===\n" + "\n".join(
+                f"  {opt.id}: {opt.display_name}" for opt in self.logic.lib_options
+            ))
+            self.python_logger.debug("=== EXAMPLE OPTIONS ===\n" + "\n".join(
+                f"  {opt.id}: {opt.display_name}"
+                f"{f', depends_on: {opt.depends_on}' if opt.depends_on else ''}"
+                for opt in self.logic.example_options
+            ))
 
     def on_select_changed(self, event: Select.Changed) -> None:
-        """Handle library/example selection changes and update flash button state based on dependencies."""
-        grid = self.query_one("#table")
-        all_selects = list(grid.query(Select))
-        select_index = -1
-        for i, select in enumerate(all_selects):
-            if select == event.select:
-                select_index = i
-                break
-
-        if select_index >= 0:
-            row_index = select_index // 2
-            lib_select = all_selects[row_index * 2]
-            example_select = all_selects[row_index * 2 + 1]
-            flash_buttons = [btn for btn in grid.query(Button) if btn.id and btn.id.startswith("flash-")]
-            if row_index < len(flash_buttons):
-                flash_button = flash_buttons[row_index]
-                lib_selected = lib_select.value is not None and lib_select.value != Select.BLANK
-                example_selected = example_select.value is not None and example_select.value != Select.BLANK
-                dependencies_ok = True
-                if lib_selected and example_selected:
-                    dependencies_ok = self.logic.check_dependencies(lib_select.value, example_select.value)
-
-                    example_option = self.logic.get_example_option_by_id(example_select.value)
-                    if example_option and example_option.depends_on:
-                        lib_option = self.logic.get_lib_option_by_id(lib_select.value)
-                        msg_str = (
-                            f"Dependency check: {example_select.value} requires {example_option.depends_on}, "
-                            f"selected {lib_option.id if lib_option else 'unknown'} -> "
-                            f"{'OK' if dependencies_ok else 'FAIL'}"
-                        )
-                        if dependencies_ok:
-                            self.python_logger.debug(msg_str)
-                        else:
-                            self.python_logger.warning(msg_str)
-                all_conditions_met = lib_selected and example_selected and dependencies_ok
-                flash_button.disabled = not all_conditions_met
+        """
+        Handle library/example selection changes.
+        Rapid changes on the same row are coalesced into a single dependency check.
+        """
+        row = self._row_by_select.get(event.select)
+        if row is None:
+            return
+        pending = self._pending_recompute.pop(row.port, None)
+        if pending is not None:
+            pending.stop()
+        self._pending_recompute[row.port] = self.set_timer(
+            self.RECOMPUTE_DELAY, partial(self._recompute_row, row)
+        )
+
+    def _recompute_row(self, row: Row) -> None:
+        """Update flash button state of given table row based on selections and dependencies."""
+        self._pending_recompute.pop(row.port, None)
+        lib_select, example_select = row.lib_select, row.example_select
+        lib_selected = lib_select.value is not None and lib_select.value != Select.BLANK
+        example_selected = example_select.value is not None and example_select.value != Select.BLANK
+        dependencies_ok = True
+        if lib_selected and example_selected:
+            dependencies_ok = self.logic.check_dependencies(lib_select.value, example_select.value)
+
+            example_option = self.logic.get_example_option_by_id(example_select.value)
+            if example_option and example_option.depends_on:
+                lib_option = self.logic.get_lib_option_by_id(lib_select.value)
+                msg_str = (
+                    f"Dependency check: {example_select.value} requires {example_option.depends_on}, "
+                    f"selected {lib_option.id if lib_option else 'unknown'} -> "
+                    f"{'OK' if dependencies_ok else 'FAIL'}"
+                )
+                if dependencies_ok:
+                    self.python_logger.debug(msg_str)
+                else:
+                    self.python_logger.warning(msg_str)
+        all_conditions_met = lib_selected and example_selected and dependencies_ok
+        row.flash_button.disabled = not all_conditions_met
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id and event.button.id.startswith("flash-"):
@@ -144,20 +168,12 @@ class BuildFlashTab(Container):
 
     def _on_flash_pressed(self, event: Button.Pressed) -> None:
         """Handle flash button press - start async build and flash process."""
-        port = event.button.id.replace("flash-", "")
-        grid = self.query_one("#table")
-        buttons = [btn for btn in grid.query(Button) if btn.id and btn.id.startswith("flash-")]
-
-        for i, btn in enumerate(buttons):
-            if btn == event.button:
-                base_idx = 4 + i * 4
-                lib_select = grid.children[base_idx + 1]
-                example_select = grid.children[base_idx + 2]
-                self.run_worker(
-                    self.logic.config_compile_flash(port, lib_select.value, example_select.value),
-                    name=f"flash_{port}"
-                )
-                break
+        port = event.button.id.removeprefix("flash-")
+        row = self._row_by_port[port]
+        self.run_worker(
+            self.logic.config_compile_flash(port, row.lib_select.value, row.example_select.value),
+            name=f"flash_{port}"
+        )
     
     def _on_clear_log_pressed(self, event: Button.Pressed) -> None:
         """Clear only the Build & Flash RichLog"""
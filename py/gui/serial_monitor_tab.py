@@ -7,6 +7,8 @@ Provides controls for managing multiple serial port monitors with show/hide and
 Monitors continue running in background when hidden and preserve their log history.
 '''
 
+from dataclasses import dataclass
+from typing import Dict, Optional
 from textual.app import ComposeResult
 from textual.containers import Grid, Container
 from textual.widgets import Static, Button, Log
@@ -14,6 +16,16 @@ from py.log.rich_log_handler import RichLogHandler
 from py.monitor.shell_monitor_logic import ShellMonitorLogic
 
 
+@dataclass(slots=True)
+class MonitorPortState:
+    """
+    GUI state of one port in the serial monitor tab.
+    """
+    log: Optional[Log] = None  # created on first show, kept while hidden
+    visible: bool = False
+    running: bool = False
+
+
 class SerialMonitorsTab(Container):
     """
     Serial monitoring tab with dual-panel layout.
@@ -32,8 +44,9 @@ class SerialMonitorsTab(Container):
         self.ports = ports
         self.python_logger = python_logger
         self.max_log_lines = max_log_lines
-        self.active_monitor_logs = {}  # port -> Log widget
-        self.monitor_visibility = {}  # port -> bool (True = visible, False = hidden)
+        self.port_states: Dict[str, MonitorPortState] = {port: MonitorPortState() for port in ports}
+        self._visible_count = 0  # number of visible monitor logs
+        self._placeholder: Static | None = None  # mounted while no monitor log is visible
         
         # Initialize monitor logic
         self.monitor_logic = monitor_logic
@@ -57,7 +70,13 @@ class SerialMonitorsTab(Container):
                 yield from self._monitor_table()
 
         with Container(id="serial-right-panel"):
-            yield Static("Monitor Output - monitors will appear here", id="monitor-placeholder")
+            self._placeholder = self._create_placeholder()
+            yield self._placeholder
+
+    @staticmethod
+    def _create_placeholder() -> Static:
+        """Create placeholder shown in right panel when no monitor log is visible."""
+        return Static("Monitor Output - monitors will appear here", id="monitor-placeholder")
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id and event.button.id.startswith("open-"):
@@ -69,10 +88,8 @@ class SerialMonitorsTab(Container):
         
     def _on_open_pressed(self, event: Button.Pressed) -> None:
         """Handle open/hide button toggle for port visibility"""
-        port = event.button.id.replace("open-", "")
-        current_text = str(event.button.label)
-        
-        if "Show" in current_text:
+        port = event.button.id.removeprefix("open-")
+        if not self.port_states[port].visible:
             # Show the monitor log for this port
             event.button.label = "- Hide"
             self._add_monitor_log(port)
@@ -85,15 +102,15 @@ class SerialMonitorsTab(Container):
 
     def _on_run_pressed(self, event: Button.Pressed) -> None:
         """Handle start/stop button toggle for port monitoring"""
-        port = event.button.id.replace("run-", "")
-        current_text = str(event.button.label)
-        
-        if "Start" in current_text:
+        port = event.button.id.removeprefix("run-")
+        state = self.port_states[port]
+        if not state.running:
             # Start monitoring
             event.button.label = "▣ Stop"
+            state.running = True
             
             # If monitor log is not visible, show it first
-            if port not in self.active_monitor_logs:
+            if state.log is None:
                 # Update open button to Hide state
                 open_button = self.query_one(f"#open-{port}")
                 open_button.label = "- Hide"
@@ -105,16 +122,17 @@ class SerialMonitorsTab(Container):
         else:
             # Stop monitoring
             event.button.label = "▶ Start"
+            state.running = False
             # Run async stop in background
             self.app.run_worker(self._stop_monitoring(port), exclusive=False)
             self.python_logger.debug(f"Stop monitoring port {port}")
 
     def _on_clear_pressed(self, event: Button.Pressed) -> None:
         """Clear log content for the given port if the log exists."""
-        port = event.button.id.replace("clear-", "")
+        port = event.button.id.removeprefix("clear-")
         try:
-            if port in self.active_monitor_logs:
-                serial_logger = self.active_monitor_logs[port]
+            serial_logger = self.port_states[port].log
+            if serial_logger is not None:
                 serial_logger.clear()
                 self.python_logger.info(f"Cleared log for port {port}")
             else:
@@ -128,41 +146,46 @@ class SerialMonitorsTab(Container):
         """Show Log for monitoring port output (create if doesn't exist)"""
         try:
             right_panel = self.query_one("#serial-right-panel")
+            state = self.port_states[port]
             
             # Check if Log already exists
-            if port in self.active_monitor_logs:
+            if state.log is not None:
                 # Log exists, just show it
                 container = self.query_one(f"#monitor-container-{port}")
                 container.styles.display = "block"
-                self.monitor_visibility[port] = True
+                if not state.visible:
+                    self._visible_count += 1
+                state.visible = True
                 self.python_logger.debug(f"Showed existing monitor log for port {port}")
             else:
                 # Create new Log
-                monitor_container = Container(id=f"monitor-container-{port}", classes="monitor-container")
-                title = Static(f"Monitor: {port}", classes="monitor-title")
                 serial_logger = Log(
                     id=f"serial-logger-{port}",
                     classes="serial-logger",
                     max_lines=self.max_log_lines
                 )
+                monitor_container = Container(
+                    Static(f"Monitor: {port}", classes="monitor-title"),
+                    serial_logger,
+                    id=f"monitor-container-{port}",
+                    classes="monitor-container"
+                )
                 
-                # Mount container and then add content
-                right_panel.mount(monitor_container)
-                monitor_container.mount(title)
-                monitor_container.mount(serial_logger)
+                # Mount container together with its content in one step
+                with self.app.batch_update():
+                    right_panel.mount(monitor_container)
                 
                 # Store reference
-                self.active_monitor_logs[port] = serial_logger
-                self.monitor_visibility[port] = True
+                state.log = serial_logger
+                state.visible = True
+                self._visible_count += 1
                 
                 self.python_logger.debug(f"Created monitor log for port {port}")
             
             # Remove placeholder if it exists
-            try:
-                placeholder = self.query_one("#monitor-placeholder")
-                placeholder.remove()
-            except:
-                pass
+            if self._placeholder is not None:
+                self._placeholder.remove()
+                self._placeholder = None
             
             # Rebalance heights of visible logs
             self._rebalance_monitor_logs()
@@ -173,22 +196,22 @@ class SerialMonitorsTab(Container):
     def _remove_monitor_log(self, port: str) -> None:
         """Hide Log for monitoring port output (don't delete it)"""
         try:
-            if port in self.active_monitor_logs:
+            state = self.port_states[port]
+            if state.log is not None:
                 container = self.query_one(f"#monitor-container-{port}")
                 container.styles.display = "none"
-                self.monitor_visibility[port] = False
+                if state.visible:
+                    self._visible_count -= 1
+                state.visible = False
                 
                 self.python_logger.debug(f"Hidden monitor log for port {port}")
                 
                 # Check if we need to restore placeholder (all logs hidden)
-                if not any(self.monitor_visibility.values()):
-                    right_panel = self.query_one("#serial-right-panel")
-                    try:
-                        # Only add placeholder if it doesn't exist
-                        self.query_one("#monitor-placeholder")
-                    except:
-                        placeholder = Static("Monitor Output - monitors will appear here", id="monitor-placeholder")
-                        right_panel.mount(placeholder)
+                if self._visible_count == 0:
+                    if self._placeholder is None:
+                        right_panel = self.query_one("#serial-right-panel")
+                        self._placeholder = self._create_placeholder()
+                        right_panel.mount(self._placeholder)
                 else:
                     # Rebalance remaining visible logs
                     self._rebalance_monitor_logs()
@@ -199,26 +222,22 @@ class SerialMonitorsTab(Container):
     def _rebalance_monitor_logs(self) -> None:
         """Rebalance heights of all visible serial loggers"""
         try:
-            if not self.active_monitor_logs:
-                return
-            
-            # Count visible logs
-            visible_count = sum(1 for visible in self.monitor_visibility.values() if visible)
-            
+            visible_count = self._visible_count
             if visible_count == 0:
                 return
                 
             # Calculate height per visible container (equal distribution)
             height_per_container = f"{100 // visible_count}%"
             
-            # Apply height only to visible containers
-            for port, visible in self.monitor_visibility.items():
-                if visible:
-                    try:
-                        container = self.query_one(f"#monitor-container-{port}")
-                        container.styles.height = height_per_container
-                    except:
-                        pass
+            # Apply height only to visible containers, repainting once for all of them
+            with self.app.batch_update():
+                for port, state in self.port_states.items():
+                    if state.visible:
+                        try:
+                            container = self.query_one(f"#monitor-container-{port}")
+                            container.styles.height = height_per_container
+                        except:
+                            pass
                 
             self.python_logger.debug(f"Rebalanced {visible_count} visible serial loggers")
             
@@ -229,11 +248,10 @@ class SerialMonitorsTab(Container):
         """Start monitoring process for given port"""
         try:
             # Check if serial logger exists for this port
-            if port not in self.active_monitor_logs:
+            serial_logger = self.port_states[port].log
+            if serial_logger is None:
                 self.python_logger.warning(f"Cannot start monitoring for port {port} - no serial logger visible")
                 return
-                
-            serial_logger = self.active_monitor_logs[port]
             
             # Start monitoring via shell monitor logic
             success = self.monitor_logic.start_monitor_for_gui(
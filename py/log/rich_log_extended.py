@@ -3,27 +3,47 @@
 __author__ = "Ivo Marvan"
 __email__ = "ivo@marvan.cz"
 __description__ = '''
-Buffered RichLog widget with timer-based flushing for performance.
+Buffered RichLog widget with interval-timer flushing for performance.
 Prevents GUI freezing during high-frequency log output by batching writes.
-Includes emergency flush on errors and async-safe operations.
+Includes emergency flush on errors and thread-safe queued writes.
 '''
 from textual.widgets import RichLog
+import re
 import time
-import asyncio
-from typing import Any, Optional
+import queue
+from collections import deque
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Optional
+from rich.errors import MarkupError
 from rich.markup import escape
+from rich.text import Text
+
+# Messages matching this pattern are flushed immediately
+_ERR_RE = re.compile(r'error|failed|exception|❌', re.IGNORECASE)
+
+# Reusable [content, width, expand, shrink, scroll_end, animate] lists shared by all instances
+_PARAMS_POOL = deque(maxlen=1024)
 
 
 class RichLogExtended(RichLog):
     """
     Buffered RichLog with timer-based flushing and performance tracking.
-    Accumulates log messages and flushes on buffer full, timer expiry, or emergency conditions.
-    Thread-safe with async lock support.
+    Accumulates log messages and flushes on buffer full, size limit, error message or timer expiry.
+    Other threads hand over content through enqueue().
     """
+    # RichLog instances keep __dict__; slots still give direct access to per-record attributes
+    __slots__ = (
+        'buffer_size', '_flush_at', 'flush_interval', 'max_buffer_bytes', '_buffered_bytes', 'buffer',
+        'total_lines', '_flush_interval_ns', '_last_flush', 'flush_count',
+        'total_flush_time_ns', 'emergency_flush_count', '_flush_interval_timer', '_queue',
+    )
+
     def __init__(
             self,
             buffer_size: int = 10,
             flush_interval: float = 0.1,
+            max_buffer_bytes: int = 256 * 1024,
             *args,
             **kwargs
     ):
@@ -33,21 +53,30 @@ class RichLogExtended(RichLog):
         Args:
             buffer_size: Number of messages to buffer before auto-flush
             flush_interval: Time in seconds between timer-based flushes
+            max_buffer_bytes: Buffered text size in characters that forces early flush
             *args, **kwargs: Passed to parent RichLog
         """
         super().__init__(*args, **kwargs)
         
         self.buffer_size = buffer_size
+        self._flush_at = int(buffer_size)  # threshold read on every write()
         self.flush_interval = flush_interval
-        self.buffer = []
+        self.max_buffer_bytes = max_buffer_bytes
+        self._buffered_bytes = 0
+        # Unbounded; write() flushes at buffer_size entries or max_buffer_bytes, which bound it
+        self.buffer = deque()
         self.total_lines = 0
-        self._last_flush = time.time()
-        self._async_lock = asyncio.Lock()
+        self._flush_interval_ns = int(flush_interval * 1e9)
+        self._last_flush = time.monotonic_ns()
         self.flush_count = 0
-        self.total_flush_time = 0.0
-        self.avg_flush_time = 0.0
+        self.total_flush_time_ns = 0
         self.emergency_flush_count = 0
-        self._flush_timer = None
+        self._flush_interval_timer = None
+        self._queue = queue.SimpleQueue()  # thread-safe hand-off from logging handlers
+
+    def on_mount(self) -> None:
+        """Install single periodic timer for time-based flushing."""
+        self._flush_interval_timer = self.set_interval(self.flush_interval, self._maybe_flush)
     
     def write(
             self,
@@ -60,7 +89,7 @@ class RichLogExtended(RichLog):
     ) -> 'RichLogExtended':
         """
         Buffer write with timer-based flushing.
-        Flushes immediately on error messages or buffer full.
+        Flushes immediately on error messages, buffer full or buffered size limit.
         
         Args:
             content: Content to write
@@ -73,101 +102,142 @@ class RichLogExtended(RichLog):
         Returns:
             Self for chaining
         """
-        write_params = {
-            'content': content,
-            'width': width,
-            'expand': expand,
-            'shrink': shrink,
-            'scroll_end': scroll_end,
-            'animate': animate
-        }
+        params = _PARAMS_POOL.pop() if _PARAMS_POOL else [None] * 6
+        params[0] = content
+        params[1] = width
+        params[2] = expand
+        params[3] = shrink
+        params[4] = scroll_end
+        params[5] = animate
+        self.buffer.append(params)
         
-        self.buffer.append(write_params)
-        
-        content_str = str(content)
-        if any(error_word in content_str.lower() for error_word in ['error', 'failed', 'exception', '❌']):
+        # Only text is classified; other renderables would have to be rendered to get their string
+        if isinstance(content, str):
+            content_str = content
+        elif isinstance(content, Text):
+            content_str = content.plain
+        else:
+            content_str = ''
+        if _ERR_RE.search(content_str):
             self._flush_buffer()
             return self
         
-        if len(self.buffer) > self.buffer_size * 2:
+        self._buffered_bytes += len(content_str)
+        if self._buffered_bytes >= self.max_buffer_bytes:
+            # Few huge messages; flush before the per-flush render cost grows unbounded
             self.emergency_flush_count += 1
             self._flush_buffer()
-            return self
-        
-        if len(self.buffer) >= self.buffer_size:
+        elif len(self.buffer) >= self._flush_at:
             self._flush_buffer()
-            return self
-        
-        self._start_flush_timer()
         
         return self
     
-    def _start_flush_timer(self):
-        """Start or restart flush timer."""
-        if self._flush_timer and not self._flush_timer.done():
-            self._flush_timer.cancel()
-        
-        self._flush_timer = asyncio.create_task(self._timer_flush())
-    
-    async def _timer_flush(self):
-        """Flush after interval expires."""
-        await asyncio.sleep(self.flush_interval)
+    def enqueue(self, content: Any, render: Optional[Callable[[Any, 'RichLogExtended'], Any]] = None) -> None:
+        """
+        Queue content for writing on next timer tick.
+        Safe to call from any thread; no Textual objects are touched.
         
-        if self.buffer:
+        Args:
+            content: Content to write
+            render: Optional conversion render(content, widget) applied when the queue
+                is drained; widget is this RichLogExtended
+        """
+        self._queue.put_nowait((content, render))
+
+    def _drain_queue(self) -> None:
+        """Move content queued by enqueue() into write buffer."""
+        for _ in range(self._queue.qsize()):
+            try:
+                content, render = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.write(render(content, self) if render else content)
+
+    def _maybe_flush(self) -> None:
+        """Drain queued content and flush pending writes once flush interval elapsed."""
+        self._drain_queue()
+        if self.buffer and time.monotonic_ns() - self._last_flush >= self._flush_interval_ns:
             self._flush_buffer()
     
     def _flush_buffer(self) -> None:
         """
         Flush all buffered writes to parent RichLog.
+        Consecutive text entries with identical write options are joined
+        and written in one call (one render and scroll per group).
         Updates statistics and respects max_lines limit.
-        Handles MarkupError by escaping problematic characters.
         """
         if not self.buffer:
             return
         
-        if self._flush_timer and not self._flush_timer.done():
-            self._flush_timer.cancel()
-        
-        flush_start = time.time()
+        flush_start = time.monotonic_ns()
+        max_lines = self.max_lines
         
-        for write_params in self.buffer:
-            try:
-                super().write(**write_params)
-            except Exception as e:
-                # If markup parsing fails, escape the content and try again
-                if 'MarkupError' in str(type(e).__name__):
-                    content = write_params.get('content', '')
-                    if isinstance(content, str):
-                        # Escape markup characters and retry
-                        write_params['content'] = escape(str(content))
-                        try:
-                            super().write(**write_params)
-                        except Exception:
-                            # If still failing, write without any formatting
-                            write_params['content'] = str(content).replace('[', '(').replace(']', ')')
-                            super().write(**write_params)
-                else:
-                    # Re-raise non-markup errors
-                    raise
+        for options, group in groupby(self.buffer, key=itemgetter(slice(1, None))):
+            group = list(group)
+            if all(isinstance(params[0], (str, Text)) for params in group):
+                joined = Text("\n").join(self._as_text(params[0]) for params in group)
+                super().write(joined, *options)
+            else:
+                for params in group:
+                    self._write_params(params)
             
-            self.total_lines += 1
+            self.total_lines += len(group)
             
-            if self.max_lines and self.total_lines > self.max_lines:
+            if max_lines and self.total_lines > max_lines:
                 super().clear()
                 self.total_lines = 0
         
-        flush_time = time.time() - flush_start
+        self._last_flush = time.monotonic_ns()
         self.flush_count += 1
-        self.total_flush_time += flush_time
-        self.avg_flush_time = self.total_flush_time / self.flush_count
+        self.total_flush_time_ns += self._last_flush - flush_start
         
+        for params in self.buffer:
+            params[0] = None  # do not keep written content alive in the pool
+        _PARAMS_POOL.extend(self.buffer)
         self.buffer.clear()
-        self._last_flush = time.time()
+        self._buffered_bytes = 0
+
+    def _as_text(self, content: str | Text) -> Text:
+        """
+        Convert buffered text content to Rich Text the same way RichLog does.
+        Content with invalid markup is rendered literally.
+        """
+        if isinstance(content, Text):
+            return content
+        if self.markup:
+            try:
+                text = Text.from_markup(content)
+            except MarkupError:
+                text = Text(content)
+        else:
+            text = Text(content)
+        if self.highlight:
+            text = self.highlighter(text)
+        return text
+
+    def _write_params(self, params: list) -> None:
+        """
+        Write single buffered entry to parent RichLog.
+        Handles MarkupError by escaping problematic characters.
+        """
+        try:
+            super().write(*params)
+        except MarkupError:
+            content = params[0]
+            if not isinstance(content, str):
+                raise
+            # Escape markup characters and retry
+            try:
+                super().write(escape(content), *params[1:])
+            except Exception:
+                # If still failing, write without any formatting
+                super().write(content.replace('[', '(').replace(']', ')'), *params[1:])
     
     def clear(self) -> 'RichLogExtended':
         """Clear both display and buffer."""
         super().clear()
         self.buffer.clear()
+        self._buffered_bytes = 0
         self.total_lines = 0
         return self
     
@@ -182,19 +252,24 @@ class RichLogExtended(RichLog):
             'total_lines': self.total_lines,
             'buffer_size': len(self.buffer),
             'flush_count': self.flush_count,
-            'avg_flush_time': self.avg_flush_time,
+            'avg_flush_time': self.total_flush_time_ns / self.flush_count / 1e9 if self.flush_count else 0.0,
             'emergency_flush_count': self.emergency_flush_count,
             'buffer_efficiency': self.flush_count / max(1, self.total_lines) if self.total_lines > 0 else 0
         }
     
     def print_stats(self) -> 'RichLogExtended':
         """Print statistics to the log"""
-        stats = self.get_stats()
-        self.write(f"📊 RichLogExtended Stats:")
-        self.write(f"   Total lines: {stats['total_lines']}")
-        self.write(f"   Flush count: {stats['flush_count']}")
-        self.write(f"   Avg flush time: {stats['avg_flush_time']:.3f}s")
-        self.write(f"   Emergency flushes: {stats['emergency_flush_count']}")
-        self.write(f"   Buffer efficiency: {stats['buffer_efficiency']:.2f}")
+        # Pending lines go first, statistics bypass the buffer
         self._flush_buffer()
+        stats = self.get_stats()
+        stats_lines = [
+            "📊 RichLogExtended Stats:",
+            f"   Total lines: {stats['total_lines']}",
+            f"   Flush count: {stats['flush_count']}",
+            f"   Avg flush time: {stats['avg_flush_time']:.3f}s",
+            f"   Emergency flushes: {stats['emergency_flush_count']}",
+            f"   Buffer efficiency: {stats['buffer_efficiency']:.2f}",
+        ]
+        super().write("\n".join(stats_lines))
+        self.total_lines += len(stats_lines)
         return self
@@ -4,13 +4,14 @@ __author__ = "Ivo Marvan"
 __email__ = "ivo@marvan.cz"
 __description__ = '''
 Custom logging handler for Textual RichLog widget integration.
-Bridges Python logging to Textual RichLog with automatic level detection,
-source identification, and Rich markup support for colored output.
+Bridges Python logging to Textual RichLog with source identification
+and Rich markup support for colored output.
 '''
 
 import logging
-import re
 from enum import Enum
+from rich.errors import MarkupError
+from rich.text import Text
 from textual.widgets import RichLog
 from py.log.rich_log_extended import RichLogExtended
 
@@ -32,34 +33,20 @@ class LogSource(Enum):
     def __init__(self, emoji: str, display_name: str):
         self.emoji = emoji
         self.display_name = display_name
+        self.text_prefix = Text(f"{emoji} {display_name}: ")
 
 
 class RichLogHandler(logging.Handler):
     """
     Logging handler that outputs to Textual RichLog widget.
-    Supports automatic log level detection from message content,
-    source identification with emojis, and Rich markup formatting.
+    Supports source identification with emojis and Rich markup formatting.
     All handlers share single RichLog widget instance.
     """
+    __slots__ = ('_source', '_source_display_name', '_extra_color', '_text_prefix')
+
     registered_loggers = {}
+    logger_level = logging.INFO  # level of loggers created by get_logger, see set_level()
     _rich_log = None
-    _level_patterns = {
-        logging.ERROR: [
-            re.compile(r'\b(error|Error|ERROR)\b'),
-            re.compile(r'\b(failed|Failed|FAILED)\b'),
-            re.compile(r'\b(exception|Exception|EXCEPTION)\b'),
-            re.compile(r'\bE \(\d+\)\b'),  # ESP-IDF error format
-        ],
-        logging.WARNING: [
-            re.compile(r'\b(warning|Warning|WARNING)\b'),
-            re.compile(r'\b(warn|Warn|WARN)\b'),
-            re.compile(r'\bW \(\d+\)\b'),  # ESP-IDF warning format
-        ],
-        logging.INFO: [
-            re.compile(r'\b(info|Info|INFO)\b'),
-            re.compile(r'\bI \(\d+\)\b'),
-        ]
-    }
 
     @classmethod
     def set_rich_log(cls, rich_log: RichLog):
@@ -67,9 +54,25 @@ class RichLogHandler(logging.Handler):
         Set shared RichLog widget for all handlers.
         
         Args:
-            rich_log: RichLog or RichLogExtended instance
+            rich_log: RichLog or RichLogExtended instance, None to discard records
         """
         cls._rich_log = rich_log
+        for logger in cls.registered_loggers.values():
+            for handler in logger.handlers:
+                if isinstance(handler, RichLogHandler):
+                    handler._bind_emit()
+
+    @classmethod
+    def set_level(cls, level: int) -> None:
+        """
+        Set level of all loggers created by get_logger, including future ones.
+        
+        Args:
+            level: Logging level (e.g., logging.INFO)
+        """
+        cls.logger_level = level
+        for logger in cls.registered_loggers.values():
+            logger.setLevel(level)
 
     @classmethod
     def get_logger(cls, source: LogSource = LogSource.PYTHON, display_name: str = None):
@@ -92,9 +95,9 @@ class RichLogHandler(logging.Handler):
             handler = RichLogHandler(source, display_name)
             logger_name = f"{source.display_name}.{display_name}" if display_name else source.display_name
             logger = logging.getLogger(logger_name)
-            for h in logger.handlers[:]:
-                logger.removeHandler(h)
+            logger.handlers.clear()
             logger.addHandler(handler)
+            logger.setLevel(cls.logger_level)
             logger.propagate = False
             cls.registered_loggers[logger_key] = logger
             return logger
@@ -117,59 +120,58 @@ class RichLogHandler(logging.Handler):
         self._source = source
         self._source_display_name = display_name
         self._extra_color = extra_color
+        # Built once; Text is passed to RichLog so the prefix is never markup-parsed
+        if display_name:
+            self._text_prefix = Text(f"{source.emoji} {display_name}: ")
+        else:
+            self._text_prefix = source.text_prefix
+        self._bind_emit()
+
+    def _bind_emit(self) -> None:
+        """Bind emit to active or no-op implementation depending on shared RichLog presence."""
+        self.emit = self._emit_active if self._rich_log is not None else self._emit_noop
 
-    def emit(self, record: logging.LogRecord):
+    def _emit_active(self, record: logging.LogRecord):
         """
         Emit log record to RichLog widget.
+        Bound as emit while shared RichLog is set.
         
         Args:
             record: Log record to emit
         """
-        if self._rich_log:
-            record = self._modify_record(record)
-            msg = self.format(record)
-            self._rich_log.write(msg)
-            self._rich_log.refresh()
+        message = self.format(record)
+        rich_log = self._rich_log  # read once; set_rich_log() may run meanwhile
+        if isinstance(rich_log, RichLogExtended):
+            # Markup parsing and highlighting run later on the widget's own timer,
+            # so emit costs only formatting and a queue put
+            rich_log.enqueue(message, self._to_text)
+        elif rich_log is not None:
+            rich_log.write(self._to_text(message, rich_log))
 
-    def _modify_record(self, record: logging.LogRecord) -> logging.LogRecord:
-        """
-        Modify record to add source identifier and detect level from content.
-        
-        Args:
-            record: Original log record
-            
-        Returns:
-            Modified log record
-        """
-        return self._modify_message(
-            self._modify_level(record)
-        )
+    def _emit_noop(self, record: logging.LogRecord):
+        """Discard log record. Bound as emit while no RichLog is set."""
 
-    def _modify_message(self, record: logging.LogRecord = None) -> logging.LogRecord:
+    def _to_text(self, message: str, rich_log: RichLog) -> Text:
         """
-        Add source emoji and display name prefix to message.
+        Build log line from source prefix and message.
+        Message markup and highlighting follow settings of the RichLog writing the line,
+        which may no longer be the shared one when queued lines are drained.
         
         Args:
-            record: Log record
+            message: Formatted log message
+            rich_log: RichLog the line is written to
             
         Returns:
-            Modified record with prefixed message
+            Rich Text ready to be written to RichLog
         """
-        if self._source_display_name:
-            record.msg = f"{self._source.emoji} {self._source_display_name}: {record.msg}"
+        if rich_log.markup:
+            try:
+                text = Text.from_markup(message)
+            except MarkupError:
+                text = Text(message)
         else:
-            record.msg = f"{self._source.emoji} {self._source.display_name}: {record.msg}"
-        return record
-
-    def _modify_level(self, record: logging.LogRecord = None) -> logging.LogRecord:
-        """
-        Detect and update log level from message content.
-        Currently disabled to avoid unintended level changes.
-        
-        Args:
-            record: Log record
-            
-        Returns:
-            Unmodified record (level detection disabled)
-        """
-        return record
+            text = Text(message)
+        line = Text.assemble(self._text_prefix, text)
+        if rich_log.highlight:
+            line = rich_log.highlighter(line)
+        return line
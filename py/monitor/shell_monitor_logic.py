@@ -6,18 +6,31 @@ __description__ = '''
 Shell-based monitor logic using ShellCommandProcess.
 Manages monitor processes for each port with serial port streaming.
 Supports both real serial ports and fake monitoring for testing.
+Real ports are read directly, opened by pyserial-asyncio when installed, otherwise configured with termios.
 '''
 
 import os
+import sys
+import shlex
 import asyncio
-from typing import Dict
+import codecs
+import termios
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
 from py.shell_commands import ShellCommandConfig
 
+try:
+    import serial_asyncio  # optional, opens serial ports through pyserial
+except ImportError:
+    serial_asyncio = None
+
+_FAKE_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_monitor_script.py')
+
 
 class PortMonitorProcess:
     """
     Asynchronous subprocess wrapper for serial port monitoring.
-    Streams subprocess output directly to log widget character-by-character or buffered.
+    Streams subprocess output directly to log widget in chunks.
     Bypasses standard logging for real-time output display without GUI blocking.
     """
     
@@ -25,8 +38,7 @@ class PortMonitorProcess:
             self,
             config: ShellCommandConfig,
             port_log_widget,
-            read_timeout: float = 0.001,
-            chunk_size: int = 4096,
+            chunk_size: int = 65536,
             flush_interval: float = 0.05
     ):
         """
@@ -35,22 +47,18 @@ class PortMonitorProcess:
         Args:
             config: Shell command configuration with monitor command
             port_log_widget: Log widget to write output to
-            read_timeout: Timeout for subprocess read operations (seconds)
-            chunk_size: Bytes to read per operation (larger = faster)
-            flush_interval: Minimum interval between writes to widget (seconds)
+            chunk_size: Maximum bytes per read; default drains a full Linux pipe buffer at once
+            flush_interval: Maximum time partial output waits before written to widget (seconds)
         """
         self.config = config
         self.port_log_widget = port_log_widget
         self.process = None
         self.running = False
-        self.read_timeout = read_timeout
         self.chunk_size = chunk_size
         self.flush_interval = flush_interval
-        self.stdout_buffer = ""
-        self.stderr_buffer = ""
         self.stdout_task = None
-        self.stderr_task = None
-        self.last_flush_time = 0.0
+        self.writer_task = None
+        self._write_queue: asyncio.Queue = asyncio.Queue(maxsize=256)  # text chunks, None ends writer
         
     async def start(self) -> int:
         """
@@ -60,17 +68,41 @@ class PortMonitorProcess:
             Process return code
         """
         try:
-            self.process = await asyncio.create_subprocess_shell(
-                self.config.command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            if self.config.argv:
+                # No intermediate shell; terminate() signals the monitor program itself
+                self.process = await asyncio.create_subprocess_exec(
+                    *self.config.argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT  # one reader task per monitor
+                )
+            else:
+                self.process = await asyncio.create_subprocess_shell(
+                    self.config.command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT  # one reader task per monitor
+                )
             self.running = True
             
-            self.stdout_task = asyncio.create_task(self._stream_output(self.process.stdout, prefix=""))
-            self.stderr_task = asyncio.create_task(self._stream_output(self.process.stderr, prefix="STDERR: "))
-            await self.process.wait()
-            await asyncio.gather(self.stdout_task, self.stderr_task, return_exceptions=True)
+            # Reader and writer are cancelled together on error or when the worker is cancelled
+            try:
+                async with asyncio.TaskGroup() as task_group:
+                    self.writer_task = task_group.create_task(self._writer_loop())
+                    self.stdout_task = task_group.create_task(self._stream_output(self.process.stdout))
+                    await self.process.wait()
+                    self.running = False  # process is reaped, terminate() has nothing to signal
+                    # Reader ends on EOF of the closed pipe right after draining what is left in it
+                    await self.stdout_task
+                    await self._write_queue.put(None)
+            except asyncio.CancelledError:
+                # Worker cancelled (stop timeout, app shutdown); do not orphan the monitor program
+                self.running = False
+                if self.process.returncode is None:
+                    try:
+                        self.process.kill()
+                    except ProcessLookupError:
+                        pass
+                    await self.process.wait()
+                raise
             
             return self.process.returncode
             
@@ -78,72 +110,104 @@ class PortMonitorProcess:
             self._write_to_textarea(f"Process failed: {e}\n")
             return -1
             
-    async def _stream_output(self, stream, prefix: str = ""):
+    async def _stream_output(self, stream):
         """
-        Stream subprocess output to log widget with optimized buffering.
-        Reads larger chunks and flushes periodically for better performance.
+        Stream subprocess output to writer queue with optimized buffering.
+        Blocks on reads while idle; partial lines are flushed after flush_interval.
+        One read returns everything buffered in the pipe, i.e. a whole burst of lines
+        per await, where readuntil(b'\n') would need one await per line.
         
         Args:
-            stream: Asyncio stream to read from (stdout or stderr)
-            prefix: Prefix string for output lines (e.g., "STDERR: ")
+            stream: Asyncio stream to read from (stdout merged with stderr)
         """
         try:
-            buffer = ""
-            last_flush = asyncio.get_event_loop().time()
+            pending = bytearray()  # raw bytes not yet written; decoded once per flush
+            # Keeps multi-byte characters split across flushes intact
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            loop = asyncio.get_running_loop()
+            last_flush = loop.time()
             
-            while self.running:
+            # Runs until EOF, so output written just before process exit is not lost
+            while True:
+                # Sleep until data arrives; a timeout is armed only to flush pending partial output
                 try:
-                    data = await asyncio.wait_for(
-                        stream.read(self.chunk_size), 
-                        timeout=self.read_timeout
-                    )
-                    if not data:
-                        break
-                    
-                    chunk = data.decode('utf-8', errors='replace')
-                    buffer += chunk
-                    
-                    current_time = asyncio.get_event_loop().time()
-                    time_since_flush = current_time - last_flush
-                    
-                    should_flush = (
-                        '\n' in chunk or
-                        len(buffer) >= self.chunk_size or
-                        time_since_flush >= self.flush_interval
-                    )
-                    
-                    if should_flush and buffer:
-                        self._write_to_textarea(f"{prefix}{buffer}")
-                        buffer = ""
-                        last_flush = current_time
-                        
+                    if pending:
+                        timeout = max(0.0, last_flush + self.flush_interval - loop.time())
+                        data = await asyncio.wait_for(stream.read(self.chunk_size), timeout=timeout)
+                    else:
+                        data = await stream.read(self.chunk_size)
                 except asyncio.TimeoutError:
-                    if buffer:
-                        current_time = asyncio.get_event_loop().time()
-                        if current_time - last_flush >= self.flush_interval:
-                            self._write_to_textarea(f"{prefix}{buffer}")
-                            buffer = ""
-                            last_flush = current_time
+                    await self._flush_pending(pending, decoder)
+                    last_flush = loop.time()
                     continue
                 except Exception as e:
-                    self._write_to_textarea(f"Stream error: {e}\n")
+                    await self._write_queue.put(f"Stream error: {e}\n")
+                    break
+                if not data:
                     break
+                
+                pending += data.translate(None, b'\r')  # drop carriage returns in C before decoding
+                
+                current_time = loop.time()
+                should_flush = (
+                    b'\n' in data or
+                    len(pending) >= self.chunk_size or
+                    current_time - last_flush >= self.flush_interval
+                )
+                
+                if should_flush:
+                    await self._flush_pending(pending, decoder)
+                    last_flush = current_time
                     
-            if buffer:
-                self._write_to_textarea(f"{prefix}{buffer}")
+            await self._flush_pending(pending, decoder, final=True)
                     
         except Exception as e:
-            self._write_to_textarea(f"Stream error: {e}\n")
+            await self._write_queue.put(f"Stream error: {e}\n")
+
+    async def _flush_pending(self, pending: bytearray, decoder, final: bool = False) -> None:
+        """
+        Decode pending bytes, queue them for the writer and clear the buffer in place.
+        
+        Args:
+            pending: Raw bytes read since last flush
+            decoder: Incremental decoder of the stream
+            final: Flush also incomplete multi-byte sequence at end of stream
+        """
+        text = decoder.decode(pending, final=final)
+        pending.clear()
+        if text:
+            await self._write_queue.put(text)
+    
+    async def _writer_loop(self) -> None:
+        """
+        Single consumer of output queued by stream reader.
+        Everything queued since the last write goes to the widget in one call.
+        Stops on None sentinel.
+        """
+        queue = self._write_queue
+        while True:
+            text = await queue.get()
+            if text is None:
+                return
+            parts = [text]
+            while not queue.empty():
+                text = queue.get_nowait()
+                if text is None:
+                    self._write_to_textarea("".join(parts))
+                    return
+                parts.append(text)
+            self._write_to_textarea("".join(parts))
     
     def _write_to_textarea(self, text: str) -> None:
         """
         Write text to log widget.
-        Removes carriage return characters for clean output.
+        Carriage returns are already removed from raw bytes by the reader.
+        Called directly on the event loop; Log.write only appends lines,
+        so no executor hop is needed.
         
         Args:
             text: Text to write to widget
         """
-        text = text.replace('\r', '')
         try:
             self.port_log_widget.write(text)
         except Exception as e:
@@ -176,8 +240,6 @@ class PortMonitorProcess:
                     await self.process.wait()
                 if self.stdout_task:
                     await asyncio.wait_for(self.stdout_task, timeout=0.5)
-                if self.stderr_task:
-                    await asyncio.wait_for(self.stderr_task, timeout=0.5)
                     
             except asyncio.TimeoutError:
                 pass
@@ -185,6 +247,150 @@ class PortMonitorProcess:
                 print(f"Error terminating process: {e}")
 
 
+class SerialPortMonitor(asyncio.Protocol):
+    """
+    Direct serial port reader.
+    Same interface as PortMonitorProcess, but bytes arrive in data_received
+    without any subprocess and pipe copy in between.
+    Port is opened by pyserial-asyncio when installed, otherwise set up with termios
+    and read through the event loop's pipe transport.
+    """
+
+    def __init__(self, port: str, port_log_widget, baud_rate: int = 115200):
+        """
+        Initialize serial port monitor.
+        
+        Args:
+            port: Serial port name (e.g., "ttyACM0")
+            port_log_widget: Log widget to write output to
+            baud_rate: Serial port baud rate
+        """
+        self.port = port
+        self.port_log_widget = port_log_widget
+        self.baud_rate = baud_rate
+        self.running = False
+        self.transport = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._closed: Optional[asyncio.Future] = None
+
+    async def start(self) -> int:
+        """
+        Open serial port and stream its output to log widget until closed.
+        
+        Returns:
+            0 if closed by terminate(), -1 on error
+        """
+        loop = asyncio.get_running_loop()
+        self._closed = loop.create_future()
+        try:
+            if serial_asyncio is not None:
+                self.transport, _ = await serial_asyncio.create_serial_connection(
+                    loop, lambda: self, f"/dev/{self.port}",
+                    baudrate=self.baud_rate, rtscts=False, xonxoff=False
+                )
+            else:
+                tty_file = os.fdopen(self._open_raw_tty(), 'rb', buffering=0)
+                try:
+                    self.transport, _ = await loop.connect_read_pipe(lambda: self, tty_file)
+                except BaseException:
+                    tty_file.close()
+                    raise
+        except Exception as e:
+            self._write_to_textarea(f"Process failed: {e}\n")
+            return -1
+        self.running = True
+        error = await self._closed
+        if error is not None:
+            self._write_to_textarea(f"Stream error: {error}\n")
+            return -1
+        return 0
+
+    def _open_raw_tty(self) -> int:
+        """
+        Open serial port and switch it to raw mode with configured baud rate.
+        Same settings as 'stty raw -echo -ixon -ixoff -crtscts', without running stty.
+        
+        Returns:
+            Non-blocking file descriptor of the port
+        """
+        fd = os.open(f"/dev/{self.port}", os.O_RDONLY | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            iflag, oflag, cflag, lflag, _, _, cc = termios.tcgetattr(fd)
+            iflag &= ~(termios.IGNBRK | termios.BRKINT | termios.PARMRK | termios.ISTRIP |
+                       termios.INLCR | termios.IGNCR | termios.ICRNL | termios.IXON | termios.IXOFF)
+            oflag &= ~termios.OPOST
+            lflag &= ~(termios.ECHO | termios.ECHONL | termios.ICANON | termios.ISIG | termios.IEXTEN)
+            cflag &= ~(termios.CSIZE | termios.PARENB | termios.CRTSCTS)
+            cflag |= termios.CS8 | termios.CREAD
+            cc[termios.VMIN] = 1
+            cc[termios.VTIME] = 0
+            speed = getattr(termios, f"B{self.baud_rate}")
+            termios.tcsetattr(fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, speed, speed, cc])
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    def data_received(self, data: bytes) -> None:
+        """Write received bytes to log widget."""
+        decoder = self._decoder
+        data = data.translate(None, b'\r')  # drop carriage returns before decoding
+        if data.isascii() and not decoder.getstate()[0]:
+            # ESP-IDF output is almost always ASCII; skip UTF-8 state machine
+            # unless a split multi-byte sequence is pending from previous read
+            self._write_to_textarea(data.decode('ascii'))
+        else:
+            self._write_to_textarea(decoder.decode(data))
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        """Finish start() when port is closed or lost."""
+        self.running = False
+        if self._closed is not None and not self._closed.done():
+            self._closed.set_result(exc)
+
+    def _write_to_textarea(self, text: str) -> None:
+        """
+        Write text to log widget.
+        Carriage returns are already removed from raw bytes by the reader.
+        
+        Args:
+            text: Text to write to widget
+        """
+        try:
+            self.port_log_widget.write(text)
+        except Exception as e:
+            print(f"Error writing to widget: {e}")
+
+    async def run_end_wait(self) -> bool:
+        """
+        Start reading and wait until port is closed.
+        
+        Returns:
+            True if closed without error
+        """
+        return_code = await self.start()
+        return return_code == 0
+
+    async def terminate(self) -> None:
+        """Close serial port and wait for connection_lost."""
+        if self.transport and self.running:
+            self.transport.close()
+            try:
+                await asyncio.wait_for(asyncio.shield(self._closed), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+
+
+@dataclass(slots=True)
+class MonitorHandle:
+    """
+    Everything ShellMonitorLogic tracks for one monitored port.
+    """
+    process: Union[PortMonitorProcess, SerialPortMonitor]
+    log_widget: object
+    worker: Optional[object] = None
+
+
 class ShellMonitorLogic:
     """
     Manager for multiple serial port monitor processes.
@@ -192,14 +398,12 @@ class ShellMonitorLogic:
     Supports both real serial ports (/dev/ttyACM*, /dev/ttyUSB*) and fake ports for testing.
     """
     BAUD_RATE = 115200
-    PORT_PARAMS = 'raw -echo -ixon -ixoff -crtscts'
 
     
     def __init__(
         self, 
         idf_setup_path: str = "~/esp/v5.4.1/esp-idf/export.sh",
-        read_timeout: float = 0.001,
-        chunk_size: int = 4096,
+        chunk_size: int = 65536,
         flush_interval: float = 0.05
     ):
         """
@@ -207,17 +411,13 @@ class ShellMonitorLogic:
         
         Args:
             idf_setup_path: Path to ESP-IDF environment setup script
-            read_timeout: Subprocess read timeout in seconds
             chunk_size: Bytes to read per operation (larger = faster throughput)
-            flush_interval: Minimum interval between writes to widget (seconds)
+            flush_interval: Maximum time partial output waits before written to widget (seconds)
         """
         self.idf_setup_path = os.path.expanduser(idf_setup_path)
-        self.read_timeout = read_timeout
         self.chunk_size = chunk_size
         self.flush_interval = flush_interval
-        self.active_monitors: Dict[str, PortMonitorProcess] = {}
-        self.port_loggers: Dict[str, object] = {}
-        self.worker_tasks: Dict[str, object] = {}
+        self.active_monitors: Dict[str, MonitorHandle] = {}
     
     def start_monitor_for_gui(self, port: str, monitor_log_widget, gui_run_worker_method) -> bool:
         """
@@ -234,29 +434,28 @@ class ShellMonitorLogic:
         if port in self.active_monitors:
             return False
             
-        self.port_loggers[port] = monitor_log_widget
-        if port.startswith("Port"):
-            command = self._create_fake_monitor_command(port)
+        if not port.startswith("Port"):
+            process = SerialPortMonitor(port, monitor_log_widget, baud_rate=self.BAUD_RATE)
         else:
-            command = self._create_real_monitor_command(port)
-        config = ShellCommandConfig(
-            name=f"Monitor {port}",
-            command=command
-        )
-        process = PortMonitorProcess(
-            config=config, 
-            port_log_widget=monitor_log_widget,
-            read_timeout=self.read_timeout,
-            chunk_size=self.chunk_size,
-            flush_interval=self.flush_interval
-        )
+            argv = self._create_fake_monitor_command(port)
+            config = ShellCommandConfig(
+                name=f"Monitor {port}",
+                command=shlex.join(argv),
+                argv=argv
+            )
+            process = PortMonitorProcess(
+                config=config, 
+                port_log_widget=monitor_log_widget,
+                chunk_size=self.chunk_size,
+                flush_interval=self.flush_interval
+            )
         
-        self.active_monitors[port] = process
-        worker = gui_run_worker_method(
+        handle = MonitorHandle(process=process, log_widget=monitor_log_widget)
+        self.active_monitors[port] = handle
+        handle.worker = gui_run_worker_method(
             self.run_monitor_with_cleanup(port),
             name=f"monitor_{port}"
         )
-        self.worker_tasks[port] = worker
         
         return True
         
@@ -270,51 +469,60 @@ class ShellMonitorLogic:
         Returns:
             True if stopped, False if port was not being monitored
         """
-        if port not in self.active_monitors:
+        handle = self.active_monitors.get(port)
+        if handle is None:
             return False
             
-        process = self.active_monitors[port]
-        await process.terminate()
-        if port in self.worker_tasks:
-            worker = self.worker_tasks[port]
+        await handle.process.terminate()
+        worker, handle.worker = handle.worker, None
+        if worker is not None:
             try:
                 await asyncio.wait_for(worker.wait(), timeout=2.0)
             except asyncio.TimeoutError:
-                print(f"Worker for port {port} didn't finish in time")
+                print(f"Worker for port {port} didn't finish in time, cancelling")
+                worker.cancel()
             except Exception as e:
                 print(f"Error waiting for worker: {e}")
-            del self.worker_tasks[port]
         
-        del self.active_monitors[port]
-        if port in self.port_loggers:
-            del self.port_loggers[port]
+        self.active_monitors.pop(port, None)
             
         return True
         
     def is_monitoring(self, port: str) -> bool:
         """Check if port is being monitored."""
         return port in self.active_monitors
+
+    def active_ports(self) -> tuple[str, ...]:
+        """
+        Get snapshot of ports with an active monitor.
+        Readers may see a slightly stale view, which is fine for display and shutdown.
+        """
+        return tuple(self.active_monitors)
         
     async def stop_all_monitors(self) -> int:
         """
         Stop all active monitors gracefully.
+        Monitors are terminated concurrently, so shutdown takes as long as the slowest port.
         
         Returns:
             Count of stopped monitors
         """
-        stopped_count = 0
-        ports_to_stop = list(self.active_monitors.keys())
+        ports_to_stop = self.active_ports()
+        results = await asyncio.gather(
+            *(self.stop_monitor_for_gui(port) for port in ports_to_stop),
+            return_exceptions=True
+        )
         
-        for port in ports_to_stop:
-            try:
-                if await self.stop_monitor_for_gui(port):
-                    stopped_count += 1
-            except Exception as e:
-                print(f"Error stopping monitor for port {port}: {e}")
+        stopped_count = 0
+        for port, result in zip(ports_to_stop, results):
+            if isinstance(result, BaseException):
+                print(f"Error stopping monitor for port {port}: {result}")
+            elif result:
+                stopped_count += 1
                 
         return stopped_count
         
-    def _create_fake_monitor_command(self, port: str) -> str:
+    def _create_fake_monitor_command(self, port: str) -> Tuple[str, ...]:
         """
         Create command for fake monitor script.
         
@@ -322,24 +530,10 @@ class ShellMonitorLogic:
             port: Fake port identifier (e.g., "Port1")
             
         Returns:
-            Shell command string
-        """
-        script_path = os.path.join(os.path.dirname(__file__), 'fake_monitor_script.py')
-        return f"python3 {script_path} {port}"
-        
-    def _create_real_monitor_command(self, port: str) -> str:
+            Argument vector executed without shell
         """
-        Create command for real serial port monitoring.
-        Uses stty for port configuration and cat for reading.
+        return (sys.executable, _FAKE_SCRIPT_PATH, port)
         
-        Args:
-            port: Serial port name (e.g., "ttyACM0")
-            
-        Returns:
-            Shell command string
-        """
-        return f'stty -F /dev/{port} {self.BAUD_RATE} {self.PORT_PARAMS} && cat /dev/{port}'
-
     async def run_monitor_with_cleanup(self, port: str) -> bool:
         """
         Run monitor process with automatic cleanup on completion.
@@ -351,19 +545,17 @@ class ShellMonitorLogic:
         Returns:
             True if completed successfully (return code 0)
         """
-        if port not in self.active_monitors:
+        handle = self.active_monitors.get(port)
+        if handle is None:
             return False
             
-        process = self.active_monitors[port]
-        port_logger = self.port_loggers.get(port)
+        process = handle.process
+        port_logger = handle.log_widget
         
         try:
             port_logger.write(f"--- Monitor on port {port} starts 🚀 ---\n")
             success = await process.run_end_wait()
-            if port in self.active_monitors:
-                del self.active_monitors[port]
-            if port in self.port_loggers:
-                del self.port_loggers[port]
+            self.active_monitors.pop(port, None)
                 
             if port_logger:
                 if success:
@@ -376,9 +568,6 @@ class ShellMonitorLogic:
         except Exception as e:
             if port_logger:
                 port_logger.write(f"Monitor on port {port} failed: {e}\n")
-            if port in self.active_monitors:
-                del self.active_monitors[port]
-            if port in self.port_loggers:
-                del self.port_loggers[port]
+            self.active_monitors.pop(port, None)
                 
             return False
@@ -4,8 +4,10 @@ __author__ = "Ivo Marvan"
 __email__ = "ivo@marvan.cz"
 __description__ = '''
 Configuration dataclass for shell command execution.
-Stores command name and shell command string for subprocess execution.
+Stores command name and shell command string (or argument vector) for subprocess execution,
+optionally with working directory and environment.
 '''
+from typing import Optional, Tuple, Dict
 
 
 class ShellCommandConfig:
@@ -13,13 +15,33 @@ class ShellCommandConfig:
     Configuration container for shell command execution.
     Simple dataclass holding command name and command string.
     """
-    def __init__(self, name: str, command: str):
+    __slots__ = ('name', 'command', 'argv', 'cwd', 'env', 'start_new_session')
+
+    def __init__(
+            self,
+            name: str,
+            command: str,
+            argv: Optional[Tuple[str, ...]] = None,
+            cwd: Optional[str] = None,
+            env: Optional[Dict[str, str]] = None,
+            start_new_session: bool = False
+    ):
         """
         Initialize shell command configuration.
         
         Args:
             name: Human-readable command name for logging
             command: Shell command string to execute
+            argv: Optional argument vector executed directly without shell;
+                command is then used for display only
+            cwd: Optional working directory of the command (default: current directory)
+            env: Optional complete environment of the command (default: inherited)
+            start_new_session: Run command in its own process group, terminate()
+                then signals the whole group including grandchildren
         """
         self.name = name or command
         self.command = command
+        self.argv = argv
+        self.cwd = cwd
+        self.env = env
+        self.start_new_session = start_new_session
@@ -10,9 +10,59 @@ Supports pause/resume, termination, and real-time logging.
 from typing import Callable, Any
 import asyncio
 import logging
+import os
 import re
+import signal
+import weakref
+from collections import deque
+from rich.errors import MarkupError
 from py.shell_commands.shell_command_config import ShellCommandConfig
 
+# ANSI SGR codes (without leading ESC) translated to Rich markup, other codes are dropped
+_ANSI_TO_RICH = {
+    '[0;30m': '[black]',        # Black
+    '[0;31m': '[red]',          # Red
+    '[0;32m': '[green]',        # Green
+    '[0;33m': '[yellow]',       # Yellow
+    '[0;34m': '[blue]',         # Blue
+    '[0;35m': '[magenta]',      # Magenta
+    '[0;36m': '[cyan]',         # Cyan
+    '[0;37m': '[white]',        # White
+    '[1;30m': '[bold black]',   # Bold Black
+    '[1;31m': '[bold red]',     # Bold Red
+    '[1;32m': '[bold green]',   # Bold Green
+    '[1;33m': '[bold yellow]',  # Bold Yellow
+    '[1;34m': '[bold blue]',    # Bold Blue
+    '[1;35m': '[bold magenta]',  # Bold Magenta
+    '[1;36m': '[bold cyan]',    # Bold Cyan
+    '[1;37m': '[bold white]',   # Bold White
+    '[0m': '[/]',               # Reset
+    '[1m': '[bold]',
+    '[22m': '[/bold]',
+}
+_ANSI_RE = re.compile(r'\x1b(\[[0-9;]*[mK])')
+
+# Output patterns marking failed command, all checked in one search per line
+_ERROR_RE = re.compile('|'.join((
+    r"could not open port",
+    r"No such file or directory",
+    r"Permission denied",
+    r"Device or resource busy",
+    r"Connection refused",
+    r"Error:",
+    r"Failed:",
+    r"Exception:",
+    r"Traceback",
+    r"\[Errno \d+\]",  # System error codes
+    r"command not found",
+    r"bash:.*: No such file or directory",
+)), re.IGNORECASE)
+
+
+def _ansi_to_markup(match: re.Match) -> str:
+    """Replacement function of _ANSI_RE: Rich markup for known codes, empty string otherwise."""
+    return _ANSI_TO_RICH.get(match.group(1), '')
+
 
 class ShellCommandProcess:
     """
@@ -20,7 +70,10 @@ class ShellCommandProcess:
     Captures stdout/stderr, detects errors, supports pause/resume.
     Maintains global registry of all active instances.
     """
-    _instances = set()
+    _instances = weakref.WeakSet()  # does not keep instances alive if terminate() is never reached
+    MAX_OUTPUT_LINES = 10_000  # per stream; an ESP-IDF build prints a few thousand lines
+    STREAM_LIMIT = 1 << 20  # StreamReader buffer and longest accepted line (asyncio default 64 KiB)
+    READ_CHUNK_SIZE = 65536  # bytes per stream read; one Linux pipe buffer
 
     def __init__(self, config: ShellCommandConfig, logger: logging.Handler):
         """
@@ -34,9 +87,13 @@ class ShellCommandProcess:
         self.logger = logger
         self.process = None
         self.running = False
-        self.pause_output_flag = False
-        self.stdout_lines = []
-        self.stderr_lines = []
+        self._resume_event = asyncio.Event()  # cleared while output is paused
+        self._resume_event.set()
+        self._reader_tasks = ()  # stream reader tasks, cancelled by terminate()
+        self._error_match = None  # first output line matching _ERROR_RE
+        # Ring buffers keep memory bounded for long running or chatty commands
+        self.stdout_lines = deque(maxlen=self.MAX_OUTPUT_LINES)
+        self.stderr_lines = deque(maxlen=self.MAX_OUTPUT_LINES)
 
     async def start(self) -> int:
         """
@@ -46,32 +103,53 @@ class ShellCommandProcess:
             Process return code
         """
         try:
-            self.process = await asyncio.create_subprocess_shell(
-                self.config.command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            if self.config.argv:
+                # No intermediate /bin/sh; terminate() signals the command itself
+                self.process = await asyncio.create_subprocess_exec(
+                    *self.config.argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=self.config.cwd,
+                    env=self.config.env,
+                    start_new_session=self.config.start_new_session,
+                    limit=self.STREAM_LIMIT
+                )
+            else:
+                self.process = await asyncio.create_subprocess_shell(
+                    self.config.command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=self.config.cwd,
+                    env=self.config.env,
+                    start_new_session=self.config.start_new_session,
+                    limit=self.STREAM_LIMIT
+                )
             self.running = True
             ShellCommandProcess._instances.add(self)
             
-            await asyncio.wait_for(
-                asyncio.gather(
-                    self._read_stream(self.process.stdout, self.stdout_lines),
-                    self._read_stream(self.process.stderr, self.stderr_lines)
-                ),
-                timeout=300
-            )
+            # No overall timeout; builds may take long and terminate() ends the command.
+            # Failing reader cancels the other one, cancelling start() cancels both.
+            async with asyncio.TaskGroup() as task_group:
+                self._reader_tasks = (
+                    task_group.create_task(
+                        self._read_stream(self.process.stdout, self.stdout_lines, self.logger.info)),
+                    task_group.create_task(
+                        self._read_stream(self.process.stderr, self.stderr_lines, self.logger.info)),
+                )
+            await self.process.wait()
             
+            if not self.running:
+                self.logger.error("Process execution terminated")
+                return -1
             self.running = False
             ShellCommandProcess._instances.discard(self)
             return self.process.returncode or 0
             
-        except asyncio.TimeoutError:
-            self.logger.error("Process execution timed out after 5 minutes")
-            self.terminate()
-            return -1
         except Exception as e:
-            self.logger.error(f"Process execution failed: {e}")
+            # Reader errors arrive wrapped in ExceptionGroup by the TaskGroup
+            errors = e.exceptions if isinstance(e, ExceptionGroup) else (e,)
+            for error in errors:
+                self.logger.error(f"Process execution failed: {error!r}")
             self.terminate()
             return -1
 
@@ -85,77 +163,115 @@ class ShellCommandProcess:
         Returns:
             Text with Rich markup tags
         """
-        ansi_to_rich = {
-            '[0;30m': '[black]',        # Black
-            '[0;31m': '[red]',          # Red
-            '[0;32m': '[green]',        # Green
-            '[0;33m': '[yellow]',       # Yellow
-            '[0;34m': '[blue]',         # Blue
-            '[0;35m': '[magenta]',      # Magenta
-            '[0;36m': '[cyan]',         # Cyan
-            '[0;37m': '[white]',        # White
-            '[1;30m': '[bold black]',   # Bold Black
-            '[1;31m': '[bold red]',     # Bold Red
-            '[1;32m': '[bold green]',   # Bold Green
-            '[1;33m': '[bold yellow]',  # Bold Yellow
-            '[1;34m': '[bold blue]',    # Bold Blue
-            '[1;35m': '[bold magenta]',  # Bold Magenta
-            '[1;36m': '[bold cyan]',    # Bold Cyan
-            '[1;37m': '[bold white]',   # Bold White
-            '[0m': '[/]',               # Reset
-            '[1m': '[bold]',
-            '[22m': '[/bold]',
-        }
-        
-        result = text
-        for ansi_code, rich_markup in ansi_to_rich.items():
-            result = result.replace(ansi_code, rich_markup)
-        
-        ansi_pattern = re.compile(r'\x1b\[[0-9;]*[mK]')
-        result = ansi_pattern.sub('', result)
-        
-        return result
+        if '\x1b' not in text:
+            return text  # plain line, most of the output
+        return _ANSI_RE.sub(_ansi_to_markup, text)
 
-    async def _read_stream(self, stream, output_list) -> None:
+    async def _read_stream(self, stream, output_list, log_line: Callable[[str], Any]) -> None:
         """
-        Read stream lines asynchronously and log them.
+        Read stream asynchronously and log it line by line.
+        Reads whole chunks and splits them locally, so a burst of lines costs one await.
         Respects pause flag and converts ANSI codes to Rich markup.
         
         Args:
             stream: Subprocess output stream (stdout or stderr)
-            output_list: List to accumulate output lines for error detection
+            output_list: Ring buffer accumulating last output lines
+            log_line: Logging method bound for this stream
         """
+        buffer = bytearray()  # output read but not yet split into complete lines
         while self.running and stream:
-            if self.pause_output_flag:
-                await asyncio.sleep(0.1)
-                continue
-            line = await stream.readline()
-            if not line:
+            if not self._resume_event.is_set():
+                await self._resume_event.wait()
+            chunk = await stream.read(self.READ_CHUNK_SIZE)
+            if not chunk:
                 break
             
-            decoded_line = line.decode("utf-8").strip()
-            output_list.append(decoded_line)
-            
-            rich_line = self._convert_ansi_to_rich_markup(decoded_line)
-            try:
-                self.logger.info(rich_line)
-            except MarkupError as e:
-                self.logger.info(decoded_line)
+            buffer += chunk
+            end = buffer.rfind(b'\n')
+            if end < 0:
+                continue
+            lines = buffer[:end].split(b'\n')
+            del buffer[:end + 1]
+            for line in lines:
+                self._process_line(line, output_list, log_line)
+        
+        if buffer:
+            self._process_line(buffer, output_list, log_line)  # last line without newline
+
+    def _process_line(self, line: bytes, output_list, log_line: Callable[[str], Any]) -> None:
+        """
+        Store, check and log one output line.
+        
+        Args:
+            line: Raw output line without newline
+            output_list: Ring buffer accumulating last output lines
+            log_line: Logging method bound for this stream
+        """
+        # Stray non-UTF-8 byte in compiler output must not fail the whole command
+        decoded_line = line.decode("utf-8", errors="replace").strip()
+        output_list.append(decoded_line)
+        # Checked as lines arrive, so errors evicted from the ring buffer still count
+        if self._error_match is None:
+            self._error_match = _ERROR_RE.search(decoded_line)
+        
+        # ESC is looked up in raw bytes; plain lines skip the conversion call entirely
+        rich_line = self._convert_ansi_to_rich_markup(decoded_line) if b'\x1b' in line else decoded_line
+        try:
+            log_line(rich_line)
+        except MarkupError:
+            log_line(decoded_line)
 
     def pause_output(self) -> None:
         """Pause output streaming (output continues to be captured)."""
-        self.pause_output_flag = True
+        self._resume_event.clear()
 
     def resume_output(self) -> None:
         """Resume output streaming."""
-        self.pause_output_flag = False
+        self._resume_event.set()
 
     def terminate(self) -> None:
-        """Terminate running subprocess and unregister from instance registry."""
+        """
+        Terminate running subprocess and unregister from instance registry.
+        Stream readers are cancelled too, as children of the shell may keep its pipes open.
+        """
         if self.process and self.running:
-            self.process.terminate()
+            self._signal(signal.SIGTERM)
             self.running = False
             ShellCommandProcess._instances.discard(self)
+            for task in self._reader_tasks:
+                task.cancel()
+
+    async def terminate_and_wait(self, timeout: float = 5.0) -> None:
+        """
+        Terminate subprocess and wait until it exits.
+        Killed if it does not exit on SIGTERM within timeout.
+        
+        Args:
+            timeout: Seconds to wait after SIGTERM
+        """
+        if not self.process or self.process.returncode is not None:
+            return
+        self.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self._signal(signal.SIGKILL)
+            await self.process.wait()
+
+    def _signal(self, sig: int) -> None:
+        """
+        Send signal to subprocess, or to its whole process group if it runs in its own session.
+        
+        Args:
+            sig: Signal number
+        """
+        try:
+            if self.config.start_new_session:
+                os.killpg(self.process.pid, sig)
+            else:
+                self.process.send_signal(sig)
+        except ProcessLookupError:
+            pass  # already exited
 
     def is_running(self) -> bool:
         """
@@ -201,30 +317,12 @@ class ShellCommandProcess:
         Returns:
             Tuple of (error_found: bool, error_line: str or None)
         """
-        error_patterns = [
-            r"could not open port",
-            r"No such file or directory",
-            r"Permission denied",
-            r"Device or resource busy",
-            r"Connection refused",
-            r"Error:",
-            r"Failed:",
-            r"Exception:",
-            r"Traceback",
-            r"\[Errno \d+\]",  # System error codes
-            r"command not found",
-            r"bash:.*: No such file or directory"
-        ]
-        
-        all_output = self.stdout_lines + self.stderr_lines
-        
-        for line in all_output:
-            for pattern in error_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    self.logger.error(f"Error in output line: '{line}' was found with pattern: '{pattern}'")
-                    return True, line
-                    
-        return False, None
+        match = self._error_match
+        if match is None:
+            return False, None
+        line = match.string
+        self.logger.error(f"Error in output line: '{line}' matched error pattern at: '{match.group()}'")
+        return True, line
 
     @classmethod
     def terminate_all(cls) -> None:
@@ -112,7 +112,8 @@ class RunnerTestGuiApp(App, ShellCommandRunner):
             )
             yield Button("Run", id="run")
 
-        yield RichLog(highlight=True, id="status", name="testarea")
+        # Output is mostly plain counters; regex highlighting per line would dominate rendering
+        yield RichLog(highlight=False, markup=True, id="status", name="testarea")
         yield Footer()
 
     def on_run(self, n_times: int, sleep_s: float, exit_code: int) -> None:
@@ -11,14 +11,24 @@ Generates comprehensive compilation statistics.
 
 import argparse
 import asyncio
+import hashlib
+import json
 import os
+import re
+import shlex
+import subprocess
 import sys
 import time
 import logging
 from datetime import datetime
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional, TextIO
 import traceback
 
+try:
+    import uvloop  # optional, faster pipe I/O for concurrent build output
+except ImportError:
+    uvloop = None
+
 # Import our modules
 from py.app_logic import FlashApp
 from py.config.kconfig_options import ConfigOption
@@ -54,33 +64,69 @@ def setup_console_logger(verbose: bool = False):
 # Global logger (will be initialized in main)
 test_logger = None
 
+# Compiler cache shared by all workspaces; they build mostly the same ESP-IDF sources
+CCACHE_DIR = "~/.ccache_esp32"
+CCACHE_SLOPPINESS = "pch_defines,time_macros,include_file_mtime,include_file_ctime"
+CCACHE_MAXSIZE = "20G"
+
+# Digest of sdkconfig the workspace build directory was last built with successfully
+SDKCONFIG_DIGEST_FILE = os.path.join("build", ".sdkconfig.sha256")
+
+# Workspace used by all combinations in --shared-workspace mode
+SHARED_WORKSPACE_NAME = "shared"
+
+# Build log buffer; lines are written to the OS in blocks of this size, not per line
+LOG_FILE_BUFFER_SIZE = 1 << 16
+
+# Last build outcome of every combination, used to skip builds known to fail
+RESULT_CACHE_FILE = ".test_compilation_cache.json"
+
+# Rich markup tags produced by ShellCommandProcess
+_MARKUP_RE = re.compile(r'\[/?[a-z\s]+\]')
+
 
 class SimpleStreamLogger:
-    """Simple logger wrapper for ShellCommandProcess that outputs to console."""
-    def __init__(self, logger):
+    """
+    Simple logger wrapper for ShellCommandProcess that outputs to console.
+    Optionally writes every line to a log file as it arrives.
+    """
+    def __init__(self, logger, log_file: Optional[TextIO] = None, prefix: str = ""):
+        """
+        Initialize stream logger.
+        
+        Args:
+            logger: Console logger
+            log_file: Optional open log file receiving every line
+            prefix: Prefix of console lines (not written to log file), identifies
+                the build when output of concurrent builds interleaves
+        """
         self._logger = logger
+        self._log_file = log_file
+        self._prefix = prefix
         
     def info(self, message):
         """Log info message to console."""
-        # Strip Rich markup tags if present
-        import re
-        clean_msg = re.sub(r'\[/?[a-z\s]+\]', '', message)
-        self._logger.info(clean_msg)
-        sys.stdout.flush()
+        # Strip Rich markup tags if present; console handler flushes every record
+        clean_msg = _MARKUP_RE.sub('', message)
+        self._logger.info(self._prefix + clean_msg)
+        if self._log_file:
+            self._log_file.write(clean_msg + "\n")
         
     def error(self, message):
         """Log error message to console."""
-        import re
-        clean_msg = re.sub(r'\[/?[a-z\s]+\]', '', message)
-        self._logger.error(clean_msg)
-        sys.stdout.flush()
+        clean_msg = _MARKUP_RE.sub('', message)
+        self._logger.error(self._prefix + clean_msg)
+        if self._log_file:
+            self._log_file.write(clean_msg + "\n")
         
     def debug(self, message):
         """Log debug message to console."""
-        import re
-        clean_msg = re.sub(r'\[/?[a-z\s]+\]', '', message)
-        self._logger.debug(clean_msg)
-        sys.stdout.flush()
+        if not self._log_file and not self._logger.isEnabledFor(logging.DEBUG):
+            return  # dropped anyway, skip markup stripping
+        clean_msg = _MARKUP_RE.sub('', message)
+        self._logger.debug(self._prefix + clean_msg)
+        if self._log_file:
+            self._log_file.write(clean_msg + "\n")
 
 
 class CompilationResult:
@@ -110,6 +156,10 @@ class CompilationTester:
             sdkconfig_path: str = "./sdkconfig",
             menu_name: str = "*** CAN bus examples  ***",
             fail_fast: bool = False,
+            jobs: int = 1,
+            ccache: bool = True,
+            rerun_failed: bool = False,
+            shared_workspace: bool = False,
     ):
         """
         Initialize compilation tester.
@@ -120,12 +170,27 @@ class CompilationTester:
             sdkconfig_path: Path to sdkconfig file
             menu_name: Menu name in Kconfig to parse
             fail_fast: Stop at first compilation failure
+            jobs: Number of combinations compiled concurrently
+            ccache: Compile through ccache shared by all workspaces
+            rerun_failed: Build again combinations that failed with the same
+                sdkconfig and sources in a previous run
+            shared_workspace: Build all combinations in one workspace, reconfiguring it
+                for each combination (implies jobs=1)
         """
         self.idf_setup_path = os.path.expanduser(idf_setup_path)
         self.kconfig_path = kconfig_path
         self.sdkconfig_path = sdkconfig_path
         self.menu_name = menu_name
         self.fail_fast = fail_fast
+        self.shared_workspace = shared_workspace
+        self.jobs = 1 if shared_workspace else max(1, jobs)
+        self.ccache = ccache
+        self._idf_env: Optional[Dict[str, str]] = None  # loaded from setup script on first build
+        self.rerun_failed = rerun_failed
+        self._source_digest: Optional[str] = None  # computed on first build
+        self._result_cache: Dict[str, dict] = {}  # "<lib_id>_<example_id>" -> last build outcome
+        # One timestamp per run; every workspace gets a single log file per run
+        self._run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Initialize FlashApp to reuse its logic
         self.flash_app = FlashApp(
@@ -137,6 +202,141 @@ class CompilationTester:
         
         self.results: List[CompilationResult] = []
 
+    def _ccache_env(self) -> Dict[str, str]:
+        """
+        Build environment variables enabling ccache in ESP-IDF builds.
+        Base directory is the project root, so object files compiled in one workspace
+        are cache hits in the others.
+        
+        Returns:
+            Environment variables, empty if ccache is disabled
+        """
+        if not self.ccache:
+            return {}
+        return {
+            "IDF_CCACHE_ENABLE": "1",
+            "CCACHE_DIR": os.path.expanduser(CCACHE_DIR),
+            "CCACHE_BASEDIR": os.path.realpath(os.getcwd()),
+            "CCACHE_SLOPPINESS": CCACHE_SLOPPINESS,
+            "CCACHE_MAXSIZE": CCACHE_MAXSIZE,
+        }
+
+    def _get_idf_env(self) -> Dict[str, str]:
+        """
+        Get environment prepared by ESP-IDF setup script.
+        Script is sourced only once, builds then run idf.py directly without shell.
+        
+        Returns:
+            Complete environment with IDF_PATH, PATH etc. set by the setup script
+            
+        Raises:
+            RuntimeError: If the setup script fails
+        """
+        if self._idf_env is None:
+            completed = subprocess.run(
+                ["bash", "-c", f"source {shlex.quote(self.idf_setup_path)} > /dev/null && env -0"],
+                capture_output=True
+            )
+            if completed.returncode != 0:
+                raise RuntimeError(
+                    f"ESP-IDF setup script {self.idf_setup_path} failed: "
+                    f"{completed.stderr.decode(errors='replace').strip()}"
+                )
+            self._idf_env = dict(
+                item.split("=", 1)
+                for item in completed.stdout.decode(errors='replace').split("\0")
+                if "=" in item
+            )
+        return self._idf_env
+
+    def _get_source_digest(self) -> str:
+        """
+        Compute digest of project sources shared by all workspaces.
+        Uses path, size and modification time of files, file content is not read.
+        
+        Returns:
+            Hex digest of project source tree
+        """
+        if self._source_digest is None:
+            digest = hashlib.blake2b(digest_size=16)
+            # Same items _switch_to_workspace() links into workspaces
+            top_items = sorted(
+                x for x in os.listdir(".")
+                if os.path.isdir(x) and x != 'build' and not x.startswith('.')
+            )
+            top_items.append("CMakeLists.txt")
+            for top_item in top_items:
+                for root, dirs, files in os.walk(top_item):
+                    dirs[:] = sorted(d for d in dirs if d != '__pycache__' and not d.startswith('.'))
+                    for name in sorted(files):
+                        path = os.path.join(root, name)
+                        stat = os.stat(path)
+                        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+                if not os.path.isdir(top_item) and os.path.exists(top_item):
+                    stat = os.stat(top_item)
+                    digest.update(f"{top_item}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+            self._source_digest = digest.hexdigest()
+        return self._source_digest
+
+    def _build_fingerprint(self, workspace_path: str) -> str:
+        """
+        Fingerprint of everything the build of a workspace depends on.
+        
+        Args:
+            workspace_path: Workspace directory
+            
+        Returns:
+            Combined digest of workspace sdkconfig and project sources
+        """
+        return f"{self._sdkconfig_digest(workspace_path)}:{self._get_source_digest()}"
+
+    def _load_result_cache(self) -> None:
+        """Load outcomes of previous runs, missing or broken cache file means empty cache."""
+        try:
+            with open(RESULT_CACHE_FILE) as f:
+                self._result_cache = json.load(f)
+        except (OSError, ValueError):
+            self._result_cache = {}
+
+    def _save_result_cache(self) -> None:
+        """Store build outcomes for next runs."""
+        try:
+            with open(RESULT_CACHE_FILE, 'w') as f:
+                json.dump(self._result_cache, f, indent=2)
+        except OSError as e:
+            test_logger.warning(f"Failed to save result cache {RESULT_CACHE_FILE}: {e}")
+
+    @staticmethod
+    def _sdkconfig_digest(workspace_path: str) -> str:
+        """
+        Compute digest of workspace sdkconfig.
+        
+        Args:
+            workspace_path: Workspace directory
+            
+        Returns:
+            SHA-256 hex digest of sdkconfig content
+        """
+        with open(os.path.join(workspace_path, "sdkconfig"), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @staticmethod
+    def _built_sdkconfig_digest(workspace_path: str) -> str:
+        """
+        Read digest of sdkconfig of the last successful build in workspace.
+        
+        Args:
+            workspace_path: Workspace directory
+            
+        Returns:
+            Stored hex digest, empty string if workspace was not built yet
+        """
+        try:
+            with open(os.path.join(workspace_path, SDKCONFIG_DIGEST_FILE)) as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
     def get_all_valid_combinations(self) -> List[Tuple[ConfigOption, ConfigOption]]:
         """
         Get all valid lib/example combinations based on dependencies.
@@ -151,19 +351,19 @@ class CompilationTester:
         
         test_logger.info(f"Found {len(lib_options)} libraries and {len(example_options)} examples")
         
+        # Dependencies evaluated once, only compatible examples are visited
+        dependency_index = self.flash_app.build_dependency_index()
         for lib_option in lib_options:
-            for example_option in example_options:
-                # Check dependencies
-                if self.flash_app.check_dependencies(lib_option.id, example_option.id):
-                    valid_combinations.append((lib_option, example_option))
-                    test_logger.info(
-                        f"✓ Valid combination: {lib_option.display_name} + {example_option.display_name}"
-                    )
-                else:
-                    test_logger.debug(
-                        f"✗ Invalid combination (dependencies): {lib_option.display_name} + {example_option.display_name}"
-                    )
+            for example_option in dependency_index[lib_option.id]:
+                valid_combinations.append((lib_option, example_option))
+                test_logger.info(
+                    f"✓ Valid combination: {lib_option.display_name} + {example_option.display_name}"
+                )
         
+        test_logger.debug(
+            "✗ %d invalid combinations (dependencies)",
+            len(lib_options) * len(example_options) - len(valid_combinations)
+        )
         return valid_combinations
 
     async def compile_combination(
@@ -201,14 +401,17 @@ class CompilationTester:
             test_logger.info(f"Step 1: Creating workspace...")
             success_workspace = self.flash_app._switch_to_workspace(
                 lib_option.id, 
-                example_option.id
+                example_option.id,
+                workspace_name=SHARED_WORKSPACE_NAME if self.shared_workspace else None
             )
             if not success_workspace:
                 result.error_message = "Failed to create workspace"
                 test_logger.error("❌ Failed to create workspace")
                 return result
             
-            result.workspace_path = self.flash_app._workspace_path
+            # Shared FlashApp state is only valid until the first await (other builds may switch it)
+            workspace_path = self.flash_app._workspace_path
+            result.workspace_path = workspace_path
             test_logger.info(f"✓ Workspace: {result.workspace_path}")
             
             # Step 2: Update sdkconfig
@@ -224,62 +427,98 @@ class CompilationTester:
             
             test_logger.info(f"✓ sdkconfig updated")
             
+            # Skip deterministic failure: same sdkconfig and sources failed last time
+            cache_key = f"{lib_option.id}_{example_option.id}"
+            cached = self._result_cache.get(cache_key)
+            if (not self.rerun_failed and cached and not cached["success"]
+                    and cached["fingerprint"] == self._build_fingerprint(workspace_path)):
+                result.error_message = f"{cached['error_message']} (previous run, use --rerun-failed to build)"
+                result.log_file = cached["log_file"]
+                test_logger.error("❌ Failed in previous run with the same sdkconfig and sources, skipped")
+                test_logger.error(f"   Log file: {result.log_file}")
+                return result
+            
             # Step 3: Compile
             test_logger.info(f"Step 3: Compiling (this may take a while)...")
-            jobs = FlashApp.get_optimal_jobs()
+            # Concurrent builds share the CPUs
+            jobs = max(1, FlashApp.get_optimal_jobs() // self.jobs)
             test_logger.info(f"Using {jobs} parallel jobs")
             
-            # Build command
+            # Build commands; fullclean only on request, reconfigure only if sdkconfig changed.
+            # Build step runs through cmake: Ninja generator of idf.py ignores MAKEFLAGS
+            # and would use all CPUs in every concurrent build.
+            build_argv = ("cmake", "--build", "build", "-j", str(jobs))
             if fullclean:
-                command = (
-                    f"bash -c 'export MAKEFLAGS=-j{jobs} && "
-                    f"source {self.idf_setup_path} && "
-                    f"cd {self.flash_app._workspace_path} && "
-                    f"idf.py fullclean && idf.py build'"
-                )
+                steps = [("idf.py", "fullclean", "reconfigure"), build_argv]
+            elif self._sdkconfig_digest(workspace_path) != self._built_sdkconfig_digest(workspace_path):
+                steps = [("idf.py", "reconfigure"), build_argv]
             else:
-                command = (
-                    f"bash -c 'export MAKEFLAGS=-j{jobs} && "
-                    f"source {self.idf_setup_path} && "
-                    f"cd {self.flash_app._workspace_path} && "
-                    f"idf.py build'"
-                )
+                # Digest file lives in build directory, so the build is configured already
+                test_logger.info("sdkconfig unchanged since last build, incremental build only")
+                steps = [build_argv]
+            env = {**self._get_idf_env(), **self._ccache_env()}
+            command = f"cd {shlex.quote(workspace_path)} && " + " && ".join(shlex.join(argv) for argv in steps)
             
             # Create log file path
-            log_dir = os.path.join(self.flash_app._workspace_path, "test_logs")
+            log_dir = os.path.join(workspace_path, "test_logs")
             os.makedirs(log_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            log_file = os.path.join(log_dir, f"build_{timestamp}.log")
+            if self.shared_workspace:
+                log_file = os.path.join(log_dir, f"build_{self._run_timestamp}_{cache_key}.log")
+            else:
+                log_file = os.path.join(log_dir, f"build_{self._run_timestamp}.log")
             result.log_file = log_file
             
-            # Execute compilation
-            config = ShellCommandConfig(
-                name=f"Compile {lib_option.display_name} + {example_option.display_name}",
-                command=command
-            )
-            
-            # Use simple logger for process output
-            simple_logger = SimpleStreamLogger(test_logger)
-            process = ShellCommandProcess(config=config, logger=simple_logger)
-            success_compile = await process.run_end_wait()
-            
-            # Save logs to file
-            with open(log_file, 'w') as f:
-                f.write(f"Compilation test: {lib_option.display_name} + {example_option.display_name}\n")
-                f.write(f"Timestamp: {timestamp}\n")
-                f.write(f"Command: {command}\n")
-                f.write(f"{'='*80}\n\n")
-                f.write("=== STDOUT ===\n")
-                for line in process.stdout_lines:
-                    f.write(line + "\n")
-                f.write("\n=== STDERR ===\n")
-                for line in process.stderr_lines:
-                    f.write(line + "\n")
-                f.write(f"\n{'='*80}\n")
-                f.write(f"Result: {'SUCCESS' if success_compile else 'FAILED'}\n")
+            # Output goes to the log file as it arrives (stdout and stderr interleaved),
+            # nothing is collected for writing after the build. File is opened in a thread
+            # so the event loop keeps serving the other builds.
+            f = await asyncio.to_thread(open, log_file, 'w', buffering=LOG_FILE_BUFFER_SIZE)
+            with f:
+                f.write(
+                    f"Compilation test: {lib_option.display_name} + {example_option.display_name}\n"
+                    f"Run timestamp: {self._run_timestamp}\n"
+                    f"Command: {command}\n"
+                    f"{'='*80}\n\n"
+                )
+                
+                # Use simple logger for process output
+                # Concurrent builds interleave on console, each line tells its combination
+                prefix = f"[{lib_option.display_name} + {example_option.display_name}] " if self.jobs > 1 else ""
+                simple_logger = SimpleStreamLogger(test_logger, log_file=f, prefix=prefix)
+                
+                # Execute compilation steps, stop at first failing one
+                for argv in steps:
+                    config = ShellCommandConfig(
+                        name=f"Compile {lib_option.display_name} + {example_option.display_name}",
+                        command=shlex.join(argv),
+                        argv=argv,
+                        cwd=workspace_path,
+                        env=env,
+                        start_new_session=True  # cancellation stops ninja and compilers too
+                    )
+                    process = ShellCommandProcess(config=config, logger=simple_logger)
+                    try:
+                        success_compile = await process.run_end_wait()
+                    except asyncio.CancelledError:
+                        # Fail-fast cancelled this build, do not leave it running
+                        await process.terminate_and_wait()
+                        raise
+                    if not success_compile:
+                        break
+                
+                f.write(f"\n{'='*80}\nResult: {'SUCCESS' if success_compile else 'FAILED'}\n")
             
             result.success = success_compile
+            # Fingerprint after build; idf.py may have normalized sdkconfig
+            self._result_cache[cache_key] = {
+                "fingerprint": self._build_fingerprint(workspace_path),
+                "success": success_compile,
+                "error_message": "" if success_compile else "Compilation failed (see log file)",
+                "log_file": log_file,
+            }
             if success_compile:
+                # Digest after build; idf.py may have normalized sdkconfig
+                with open(os.path.join(workspace_path, SDKCONFIG_DIGEST_FILE), 'w') as f:
+                    f.write(self._sdkconfig_digest(workspace_path) + "\n")
                 test_logger.info(f"✅ Compilation SUCCESSFUL")
             else:
                 result.error_message = "Compilation failed (see log file)"
@@ -321,79 +560,174 @@ class CompilationTester:
         else:
             test_logger.info("")
         
-        # Test each combination
-        for idx, (lib_option, example_option) in enumerate(combinations, 1):
-            test_logger.info(f"\n[{idx}/{len(combinations)}] Testing combination...")
-            result = await self.compile_combination(lib_option, example_option, fullclean)
-            self.results.append(result)
+        # Setup script is sourced once for all builds
+        try:
+            self._get_idf_env()
+        except RuntimeError as e:
+            test_logger.error(f"❌ {e}")
+            return
+        self._load_result_cache()
+        
+        # Test combinations, at most self.jobs at a time; each one has its own workspace
+        semaphore = asyncio.Semaphore(self.jobs)
+        
+        async def run_combination(idx: int, lib_option: ConfigOption, example_option: ConfigOption):
+            async with semaphore:
+                test_logger.info(f"\n[{idx}/{len(combinations)}] Testing combination...")
+                return await self.compile_combination(lib_option, example_option, fullclean)
+        
+        tasks = [
+            asyncio.create_task(run_combination(idx, lib_option, example_option))
+            for idx, (lib_option, example_option) in enumerate(combinations, 1)
+        ]
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            self._save_result_cache()  # survives interrupted runs
             
             # Check fail-fast mode
-            if self.fail_fast and not result.success:
+            if self.fail_fast and any(not task.result().success for task in done):
                 test_logger.warning(f"\n⚠️  Fail-fast mode: stopping at first failure")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
                 break
         
+        # Results in combination order; cancelled builds are not reported
+        self.results.extend(
+            task.result() for task in tasks if task.done() and not task.cancelled()
+        )
+        
         # Print summary
         self.print_summary()
 
     def print_summary(self) -> None:
         """Print comprehensive test results summary."""
-        test_logger.info("\n" + "=" * 80)
-        test_logger.info("COMPILATION TEST SUMMARY")
-        test_logger.info("=" * 80 + "\n")
+        # Whole summary is collected and logged as one record
+        lines = [
+            "\n" + "=" * 80,
+            "COMPILATION TEST SUMMARY",
+            "=" * 80 + "\n",
+        ]
         
-        # Count successes and failures
-        successes = [r for r in self.results if r.success]
-        failures = [r for r in self.results if not r.success]
+        # Split successes and failures and sum durations in one pass
+        successes = []
+        failures = []
+        total_time = 0.0
+        for result in self.results:
+            total_time += result.duration
+            (successes if result.success else failures).append(result)
         
         # Print successful builds
         if successes:
-            test_logger.info(f"✅ SUCCESSFUL BUILDS ({len(successes)}):")
-            test_logger.info("-" * 80)
+            lines.append(f"✅ SUCCESSFUL BUILDS ({len(successes)}):")
+            lines.append("-" * 80)
             for result in successes:
-                test_logger.info(
+                lines.append(
                     f"  ✓ {result.lib_name:30s} + {result.example_name:30s} "
                     f"({result.duration:.1f}s)"
                 )
-            test_logger.info("")
+            lines.append("")
         
         # Print failed builds
         if failures:
-            test_logger.info(f"❌ FAILED BUILDS ({len(failures)}):")
-            test_logger.info("-" * 80)
+            lines.append(f"❌ FAILED BUILDS ({len(failures)}):")
+            lines.append("-" * 80)
             for result in failures:
-                test_logger.info(
+                lines.append(
                     f"  ✗ {result.lib_name:30s} + {result.example_name:30s}"
                 )
-                test_logger.info(f"    Error: {result.error_message}")
-                test_logger.info(f"    Workspace: {result.workspace_path}")
-                test_logger.info(f"    Log file: {result.log_file}")
-                test_logger.info("")
+                lines.append(f"    Error: {result.error_message}")
+                lines.append(f"    Workspace: {result.workspace_path}")
+                lines.append(f"    Log file: {result.log_file}")
+                lines.append("")
         
         # Print statistics
-        test_logger.info("=" * 80)
-        test_logger.info("STATISTICS:")
-        test_logger.info("-" * 80)
+        lines.append("=" * 80)
+        lines.append("STATISTICS:")
+        lines.append("-" * 80)
         total = len(self.results)
         success_count = len(successes)
         failure_count = len(failures)
         success_rate = (success_count / total * 100) if total > 0 else 0
-        total_time = sum(r.duration for r in self.results)
         
-        test_logger.info(f"  Total combinations tested: {total}")
-        test_logger.info(f"  Successful builds:         {success_count}")
-        test_logger.info(f"  Failed builds:             {failure_count}")
-        test_logger.info(f"  Success rate:              {success_rate:.1f}%")
-        test_logger.info(f"  Total compilation time:    {total_time:.1f}s ({total_time/60:.1f} min)")
+        lines.append(f"  Total combinations tested: {total}")
+        lines.append(f"  Successful builds:         {success_count}")
+        lines.append(f"  Failed builds:             {failure_count}")
+        lines.append(f"  Success rate:              {success_rate:.1f}%")
+        lines.append(f"  Total compilation time:    {total_time:.1f}s ({total_time/60:.1f} min)")
         if total > 0:
             avg_time = total_time / total
-            test_logger.info(f"  Average time per build:    {avg_time:.1f}s")
-        test_logger.info("=" * 80)
+            lines.append(f"  Average time per build:    {avg_time:.1f}s")
+        lines.append("=" * 80)
         
         # Final verdict
         if failure_count == 0:
-            test_logger.info("\n🎉 ALL TESTS PASSED! 🎉\n")
+            lines.append("\n🎉 ALL TESTS PASSED! 🎉\n")
         else:
-            test_logger.info(f"\n⚠️  {failure_count} TEST(S) FAILED ⚠️\n")
+            lines.append(f"\n⚠️  {failure_count} TEST(S) FAILED ⚠️\n")
+        test_logger.info("\n".join(lines))
+        
+        if self.ccache and total > 0:
+            self.print_ccache_stats()
+
+    def write_json_summary(self, json_path: str) -> None:
+        """
+        Write machine-readable test results for CI tooling.
+        
+        Args:
+            json_path: Output JSON file path
+        """
+        total = len(self.results)
+        success_count = sum(1 for r in self.results if r.success)
+        summary = {
+            "results": [
+                {
+                    "lib_id": r.lib_id,
+                    "lib_name": r.lib_name,
+                    "example_id": r.example_id,
+                    "example_name": r.example_name,
+                    "success": r.success,
+                    "duration": round(r.duration, 1),
+                    "error_message": r.error_message,
+                    "workspace_path": r.workspace_path,
+                    "log_file": r.log_file,
+                }
+                for r in self.results
+            ],
+            "stats": {
+                "total": total,
+                "successful": success_count,
+                "failed": total - success_count,
+                "total_time": round(sum(r.duration for r in self.results), 1),
+            },
+        }
+        try:
+            with open(json_path, 'w') as f:
+                json.dump(summary, f, indent=2)
+            test_logger.info(f"JSON summary written to {json_path}")
+        except OSError as e:
+            test_logger.error(f"❌ Failed to write JSON summary {json_path}: {e}")
+
+    def print_ccache_stats(self) -> None:
+        """Print ccache statistics (hit rate) of the shared compiler cache."""
+        # ccache comes with ESP-IDF tools, it is on PATH of the setup script environment
+        try:
+            completed = subprocess.run(
+                ["ccache", "-s"],
+                env={**self._get_idf_env(), **self._ccache_env()},
+                capture_output=True, text=True, timeout=120
+            )
+        except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+            test_logger.warning(f"Failed to get ccache statistics: {e}")
+            return
+        if completed.returncode != 0:
+            test_logger.warning(f"Failed to get ccache statistics: {completed.stderr.strip()}")
+            return
+        lines = ["CCACHE STATISTICS:", "-" * 80]
+        lines.extend(f"  {line}" for line in completed.stdout.splitlines())
+        lines.append("=" * 80)
+        test_logger.info("\n".join(lines))
 
 
 async def main():
@@ -421,13 +755,41 @@ async def main():
     parser.add_argument(
         '-f', '--fullclean',
         action='store_true',
-        help="Run fullclean before each build"
+        help="Run fullclean before each build (default: reconfigure only if sdkconfig changed)"
     )
     parser.add_argument(
         '-1', '--fail-fast',
         action='store_true',
         help="Stop at first compilation failure"
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help="Number of combinations compiled concurrently (default: 1)"
+    )
+    parser.add_argument(
+        '--shared-workspace',
+        action='store_true',
+        help=f"Build all combinations in one workspace ({FlashApp.WORKSPACES_DIR}/{SHARED_WORKSPACE_NAME}), "
+             f"reconfigured for each combination; cannot be combined with --jobs"
+    )
+    parser.add_argument(
+        '--rerun-failed',
+        action='store_true',
+        help=f"Build also combinations that failed with unchanged sdkconfig and sources "
+             f"in a previous run (default: skip them, see {RESULT_CACHE_FILE})"
+    )
+    parser.add_argument(
+        '--no-ccache',
+        action='store_true',
+        help="Do not compile through ccache (default: shared cache in ~/.ccache_esp32)"
+    )
+    parser.add_argument(
+        '--json-output',
+        metavar='PATH',
+        help="Also write test results as JSON to PATH"
+    )
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -435,6 +797,8 @@ async def main():
     )
 
     args = parser.parse_args()
+    if args.shared_workspace and args.jobs > 1:
+        parser.error("--shared-workspace builds in one directory, use it with --jobs 1")
 
     # Setup console logger
     test_logger = setup_console_logger(verbose=args.verbose)
@@ -450,13 +814,21 @@ async def main():
         kconfig_path=args.kconfig,
         sdkconfig_path=args.sdkconfig,
         fail_fast=args.fail_fast,
+        jobs=args.jobs,
+        ccache=not args.no_ccache,
+        rerun_failed=args.rerun_failed,
+        shared_workspace=args.shared_workspace,
     )
 
     # Run all tests
     await tester.run_all_tests(fullclean=args.fullclean)
+    if args.json_output:
+        tester.write_json_summary(args.json_output)
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt: